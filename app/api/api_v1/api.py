@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.api_v1.endpoints import game, pfx, player, season, team
+from app.api.api_v1.endpoints import data, game, pfx, player, season, team
 
 api_router = APIRouter()
+api_router.include_router(data.router, prefix="/data", tags=["data"])
 api_router.include_router(game.router, prefix="/game", tags=["game"])
 api_router.include_router(pfx.router, prefix="/pfx", tags=["pitchfx"])
 api_router.include_router(player.router, prefix="/player")
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.core.cache import cache, local_cache
+from app.data.season_data import season_data
+from app.schemas import CacheStatsSchema, DataStatusSchema
+
+router = APIRouter()
+
+
+@router.get("/status", response_model=DataStatusSchema)
+@cache()
+def get_data_status():
+    return {"ready": season_data.all_seasons_ready, "seasons": season_data.report()}
+
+
+@router.get("/cache", response_model=CacheStatsSchema)
+@cache()
+def get_cache_stats():
+    return local_cache.report()
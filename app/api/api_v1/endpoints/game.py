@@ -2,11 +2,11 @@ from http import HTTPStatus
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache
 from vigorish.app import Vigorish
 from vigorish.util.string_helpers import validate_at_bat_id
 
 from app.core import crud
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schema_prep import convert_boxscore_data
 from app.schemas import AtBatSchema, BoxscoreSchema
@@ -24,8 +24,7 @@ def get_boxscore_for_game(request: Request, response: Response, game_id: str, ap
 @router.get("/all_pbp", response_model=List[AtBatSchema])
 @cache()
 def get_play_by_play_for_game(request: Request, response: Response, game_id: str, app: Vigorish = Depends(get_vig_app)):
-    game_data = crud.get_game_data(game_id, app)
-    return game_data.get_all_at_bats_no_pfx()
+    return crud.get_all_at_bats_for_game(game_id, app)
 
 
 @router.get("/pbp", response_model=AtBatSchema)
@@ -37,8 +36,7 @@ def get_play_by_play_for_at_bat(
     if result.failure:
         raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=f"At Bat ID: {at_bat_id} is invalid")
     game_id = result.value["game_id"]
-    game_data = crud.get_game_data(game_id, app)
-    at_bat_data = game_data.get_pbp_for_at_bat(at_bat_id)
+    at_bat_data = crud.get_pbp_for_at_bat(at_bat_id, game_id, app)
     if not at_bat_data:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     return at_bat_data
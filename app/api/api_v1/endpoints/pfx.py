@@ -2,12 +2,12 @@ from http import HTTPStatus
 from typing import List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache
 from vigorish.app import Vigorish
 from vigorish.util.string_helpers import validate_at_bat_id
 
 from app.api.dependencies import get_pitch_app_params
 from app.core import crud
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schema_prep import convert_pfx_times_to_est
 from app.schemas import PitchFxSchema
@@ -43,8 +43,7 @@ def get_all_pfx_data_for_at_bat(
     if result.failure:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     at_bat_dict = result.value
-    game_data = crud.get_game_data(at_bat_dict["game_id"], app)
-    pfx = game_data.get_pfx_for_at_bat(at_bat_id)
+    pfx = crud.get_pfx_for_at_bat(at_bat_id, at_bat_dict["game_id"], app)
     if not pfx:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     return [convert_pfx_times_to_est(p) for p in pfx]
@@ -3,9 +3,9 @@ from http import HTTPStatus
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache
 from vigorish.app import Vigorish
 
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schemas import CombinedBatStatsSchema, CareerBatStatsSchema
 from app.schema_prep import (
@@ -19,6 +19,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=CombinedBatStatsSchema)
+@cache()
 def get_bat_stats_for_career_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -29,6 +30,7 @@ def get_bat_stats_for_career_for_player(
 
 
 @router.get("/by_year", response_model=List[CombinedBatStatsSchema])
+@cache()
 def get_bat_stats_by_year_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -39,6 +41,7 @@ def get_bat_stats_by_year_for_player(
 
 
 @router.get("/by_team", response_model=List[CombinedBatStatsSchema])
+@cache()
 def get_bat_stats_by_team_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -49,6 +52,7 @@ def get_bat_stats_by_team_for_player(
 
 
 @router.get("/by_team_by_year", response_model=List[CombinedBatStatsSchema])
+@cache()
 def get_bat_stats_by_team_by_year_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
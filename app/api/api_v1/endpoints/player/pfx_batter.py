@@ -2,40 +2,36 @@ from http import HTTPStatus
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache, cache_one_day, cache_one_week
+from sqlalchemy.ext.asyncio import AsyncSession
 from vigorish.app import Vigorish
-from vigorish.database import PitchFx
 
 from app.api.dependencies import get_date_range, MLBSeason
 from app.core import crud
-from app.core.database import get_vig_app
-from app.schema_prep import combine_career_and_yearly_pfx_batting_metrics_sets
+from app.core.cache import cache
+from app.core.database import get_async_db_session, get_vig_app
+from app.schema_prep import combine_career_and_yearly_pfx_batting_metrics_sets, convert_pfx_list_without_game_data
 from app.schemas import PitchFxMetricsSetSchema, PitchFxSchema
 
 router = APIRouter()
 
 
 @router.get("/in_date_range", response_model=List[PitchFxSchema])
-def get_all_pfx_within_date_range_for_player(
+@cache()
+async def get_all_pfx_within_date_range_for_player(
     request: Request,
     response: Response,
     mlb_id: int,
     date_range: tuple = Depends(get_date_range),
-    app: Vigorish = Depends(get_vig_app),
+    session: AsyncSession = Depends(get_async_db_session),
 ):
     start_date, end_date = date_range
-    player_data = crud.get_player_data(mlb_id, app)
-    return (
-        app.db_session.query(PitchFx)
-        .filter(PitchFx.batter_id == player_data.player.id)
-        .filter(PitchFx.game_date >= start_date)
-        .filter(PitchFx.game_date <= end_date)
-        .all()
-    )
+    player = await crud.get_player_async(mlb_id, session)
+    pfx = await crud.get_pfx_for_batter_in_date_range_async(player.id, start_date, end_date, session)
+    return convert_pfx_list_without_game_data(pfx)
 
 
 @router.get("/", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -47,7 +43,7 @@ def get_pfx_metrics_for_career_for_batter(
 
 
 @router.get("/vs_rhp", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_rhp_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -59,7 +55,7 @@ def get_pfx_metrics_vs_rhp_for_career_for_batter(
 
 
 @router.get("/vs_lhp", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_lhp_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -71,7 +67,7 @@ def get_pfx_metrics_vs_lhp_for_career_for_batter(
 
 
 @router.get("/vs_rhp_as_rhb", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_rhp_as_rhb_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -83,7 +79,7 @@ def get_pfx_metrics_vs_rhp_as_rhb_for_career_for_batter(
 
 
 @router.get("/vs_rhp_as_lhb", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_rhp_as_lhb_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -95,7 +91,7 @@ def get_pfx_metrics_vs_rhp_as_lhb_for_career_for_batter(
 
 
 @router.get("/vs_lhp_as_lhb", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_lhp_as_lhb_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -107,7 +103,7 @@ def get_pfx_metrics_vs_lhp_as_lhb_for_career_for_batter(
 
 
 @router.get("/vs_lhp_as_rhb", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_lhp_as_rhb_for_career_for_batter(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -119,7 +115,7 @@ def get_pfx_metrics_vs_lhp_as_rhb_for_career_for_batter(
 
 
 @router.get("/career_pfx")
-@cache_one_week()
+@cache()
 def get_all_pfx_career_data(request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)):
     player_data = crud.get_player_data(mlb_id, app)
     career_pfx = player_data.get_all_pfx_batting_career_data()
@@ -128,7 +124,7 @@ def get_all_pfx_career_data(request: Request, response: Response, mlb_id: str, a
 
 
 @router.get("/for_year", response_model=PitchFxMetricsSetSchema)
-@cache_one_day()
+@cache()
 def get_pfx_metrics_for_year_for_batter(
     request: Request,
     response: Response,
@@ -2,12 +2,12 @@ from http import HTTPStatus
 from typing import Dict, List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache, cache_one_day, cache_one_week
 from vigorish.app import Vigorish
 from vigorish.util.list_helpers import flatten_list2d
 
 from app.api.dependencies import get_date_range, get_pitch_app_params, MLBSeason
 from app.core import crud
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schema_prep import combine_career_and_yearly_pfx_pitching_metrics_sets
 from app.schemas import (
@@ -38,7 +38,7 @@ def get_all_pfx_within_date_range_for_player(
 
 
 @router.get("/", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_career_pfx_metrics_for_pitcher(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -50,7 +50,7 @@ def get_career_pfx_metrics_for_pitcher(
 
 
 @router.get("/percentiles", response_model=List[PitchTypePercentilesSchema])
-@cache_one_week()
+@cache()
 def get_career_percentiles_for_pitch_types(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -59,7 +59,7 @@ def get_career_percentiles_for_pitch_types(
 
 
 @router.get("/vs_RHB", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_career_pfx_metrics_vs_rhb_for_pitcher(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -71,7 +71,7 @@ def get_career_pfx_metrics_vs_rhb_for_pitcher(
 
 
 @router.get("/vs_RHB/percentiles", response_model=List[PitchTypePercentilesSchema])
-@cache_one_week()
+@cache()
 def get_career_percentiles_vs_rhb_for_pitch_types(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -80,7 +80,7 @@ def get_career_percentiles_vs_rhb_for_pitch_types(
 
 
 @router.get("/vs_LHB", response_model=PitchFxMetricsSetSchema)
-@cache_one_day()
+@cache()
 def get_career_pfx_metrics_vs_lhb_for_pitcher(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -92,7 +92,7 @@ def get_career_pfx_metrics_vs_lhb_for_pitcher(
 
 
 @router.get("/vs_LHB/percentiles", response_model=List[PitchTypePercentilesSchema])
-@cache_one_week()
+@cache()
 def get_career_percentiles_vs_lhb_for_pitch_types(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -101,7 +101,7 @@ def get_career_percentiles_vs_lhb_for_pitch_types(
 
 
 @router.get("/career_pfx", response_model=CareerPfxMetricsForPitcherSchema)
-@cache_one_week()
+@cache()
 def get_all_pfx_career_data(request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)):
     player_data = crud.get_player_data(mlb_id, app)
     career_pfx = player_data.get_all_pfx_career_data()
@@ -110,7 +110,7 @@ def get_all_pfx_career_data(request: Request, response: Response, mlb_id: str, a
 
 
 @router.get("/for_year", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_for_year_for_pitcher(
     request: Request,
     response: Response,
@@ -126,7 +126,7 @@ def get_pfx_metrics_for_year_for_pitcher(
 
 
 @router.get("/by_year/percentiles", response_model=Dict[int, List[PitchTypePercentilesSchema]])
-@cache_one_week()
+@cache()
 def get_percentiles_for_pitch_types_by_year(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -135,7 +135,7 @@ def get_percentiles_for_pitch_types_by_year(
 
 
 @router.get("/vs_RHB/for_year", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_rhb_for_year_for_pitcher(
     request: Request,
     response: Response,
@@ -151,7 +151,7 @@ def get_pfx_metrics_vs_rhb_for_year_for_pitcher(
 
 
 @router.get("/vs_RHB/by_year/percentiles", response_model=Dict[int, List[PitchTypePercentilesSchema]])
-@cache_one_week()
+@cache()
 def get_percentiles_vs_rhb_for_pitch_types_by_year(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -160,7 +160,7 @@ def get_percentiles_vs_rhb_for_pitch_types_by_year(
 
 
 @router.get("/vs_LHB/for_year", response_model=PitchFxMetricsSetSchema)
-@cache_one_week()
+@cache()
 def get_pfx_metrics_vs_lhb_for_year_for_pitcher(
     request: Request,
     response: Response,
@@ -176,7 +176,7 @@ def get_pfx_metrics_vs_lhb_for_year_for_pitcher(
 
 
 @router.get("/vs_LHB/by_year/percentiles", response_model=Dict[int, List[PitchTypePercentilesSchema]])
-@cache_one_week()
+@cache()
 def get_percentiles_vs_lhb_for_pitch_types_by_year(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -4,9 +4,10 @@ from typing import List
 
 import vigorish.database as db
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache, cache_one_week
 from vigorish.app import Vigorish
 
+from app.core import crud
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schemas import CombinedPitchStatsSchema, CareerPitchStatsSchema
 from app.schema_prep import (
@@ -20,7 +21,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_career_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -31,7 +32,7 @@ def get_pitch_stats_for_career_for_player(
 
 
 @router.get("/as_sp", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_as_sp_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -42,7 +43,7 @@ def get_pitch_stats_as_sp_for_player(
 
 
 @router.get("/as_rp", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_as_rp_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -53,7 +54,7 @@ def get_pitch_stats_as_rp_for_player(
 
 
 @router.get("/by_year", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_year_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -65,7 +66,7 @@ def get_pitch_stats_by_year_for_player(
 
 
 @router.get("/by_team", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_team_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -77,7 +78,7 @@ def get_pitch_stats_by_team_for_player(
 
 
 @router.get("/by_team_by_year", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_team_by_year_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -89,7 +90,7 @@ def get_pitch_stats_by_team_by_year_for_player(
 
 
 @router.get("/by_opp_team", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_opp_team_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -101,7 +102,7 @@ def get_pitch_stats_by_opp_team_for_player(
 
 
 @router.get("/by_opp_team_by_year", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_opp_team_by_year_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -113,7 +114,7 @@ def get_pitch_stats_by_opp_team_by_year_for_player(
 
 
 @router.get("/career_stats", response_model=CareerPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_career_pitch_stats_for_player(
     request: Request, response: Response, mlb_id: str, app: Vigorish = Depends(get_vig_app)
 ):
@@ -143,7 +144,4 @@ def get_pitch_app_ids_for_game(request: Request, response: Response, mlb_id: str
     player_id = db.PlayerId.find_by_mlb_id(app.db_session, mlb_id)
     if not player_id:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
-    pitch_app_status_list = (
-        app.db_session.query(db.PitchAppScrapeStatus).filter_by(pitcher_id=player_id.db_player_id).all()
-    )
-    return [p.pitch_app_id for p in pitch_app_status_list]
+    return crud.get_pitch_app_ids_for_pitcher(player_id.db_player_id, app)
@@ -4,13 +4,14 @@ from typing import List
 
 import vigorish.database as db
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache, cache_one_day, cache_one_hour
+from sqlalchemy.ext.asyncio import AsyncSession
 from vigorish.app import Vigorish
 from vigorish.util.dt_format_strings import DATE_ONLY
 
-from app.api.dependencies import MLBGameDate, MLBSeason
+from app.api.dependencies import get_mlb_game_date_async, get_mlb_season_async, MLBGameDate, MLBSeason
 from app.core import crud
-from app.core.database import get_vig_app
+from app.core.cache import cache
+from app.core.database import get_async_db_session, get_vig_app
 from app.schema_prep import (
     convert_bat_stats,
     convert_scoreboard_data,
@@ -33,19 +34,16 @@ router = APIRouter()
 
 @router.get("", response_model=SeasonSchema)
 @cache()
-def get_season(
-    request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
-):
-    season = db.Season.find_by_year(app.db_session, season.year)
-    if not season:
-        raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
-    return season
+async def get_season(request: Request, response: Response, season: MLBSeason = Depends(get_mlb_season_async)):
+    return convert_season_to_dict(season)
 
 
 @router.get("/all", response_model=List[SeasonSchema])
 @cache()
-def get_all_regular_seasons(request: Request, response: Response, app: Vigorish = Depends(get_vig_app)):
-    all_mlb_seasons = db.Season.get_all_regular_seasons(app.db_session)
+async def get_all_regular_seasons(
+    request: Request, response: Response, session: AsyncSession = Depends(get_async_db_session)
+):
+    all_mlb_seasons = await crud.get_all_regular_seasons_async(session)
     if not all_mlb_seasons:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     return list(map(convert_season_to_dict, filter(lambda x: x.year > 2016 and x.year < 2023, all_mlb_seasons)))
@@ -53,34 +51,39 @@ def get_all_regular_seasons(request: Request, response: Response, app: Vigorish
 
 @router.get("/all_dates")
 @cache()
-def get_all_dates_in_season(
-    request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
+async def get_all_dates_in_season(
+    request: Request,
+    response: Response,
+    season: MLBSeason = Depends(get_mlb_season_async),
+    session: AsyncSession = Depends(get_async_db_session),
 ):
-    all_dates = crud.get_all_dates_in_season(season.year, app)
+    all_dates = await crud.get_all_dates_in_season_async(season.year, session)
     if not all_dates:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     return [dt.strftime(DATE_ONLY) for dt in all_dates]
 
 
 @router.get("/most_recent_scraped_date")
+@cache()
 def get_most_recent_scraped_date(request: Request, response: Response, app: Vigorish = Depends(get_vig_app)):
     return app.get_most_recent_scraped_date().strftime(DATE_ONLY)
 
 
 @router.get("/standings", response_model=TeamLeagueStandings)
-@cache_one_day()
+@cache()
 def get_regular_season_standings(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
     if season.year == datetime.today().year and app.regular_season_is_in_progress():
-        all_teams = app.scraped_data.get_season_standings(season.year)
+        most_recent = db.Season.get_most_recent_scraped_date(app.db_session, season.year)
+        all_teams = crud.get_season_standings(season.year, most_recent, app)
     else:
         all_teams = [team.as_dict() for team in db.Team.get_all_teams_for_season(app.db_session, season.year)]
     return create_divisional_standings(all_teams)
 
 
 @router.get("/standings_on_date", response_model=TeamLeagueStandings)
-@cache_one_day()
+@cache()
 def get_standings_on_date(
     request: Request,
     response: Response,
@@ -97,16 +100,19 @@ def get_standings_on_date(
     if season["year"] != datetime.today().year and game_date == season_end_date:
         all_teams = [team.as_dict() for team in db.Team.get_all_teams_for_season(app.db_session, season["year"])]
         return create_divisional_standings(all_teams)
-    all_teams = app.scraped_data.get_season_standings(season["year"], game_date)
+    all_teams = crud.get_season_standings(season["year"], game_date, app)
     return create_divisional_standings(all_teams)
 
 
 @router.get("/game_ids")
 @cache()
-def get_all_game_ids_for_date(
-    request: Request, response: Response, game_date: MLBGameDate = Depends(), app: Vigorish = Depends(get_vig_app)
+async def get_all_game_ids_for_date(
+    request: Request,
+    response: Response,
+    game_date: MLBGameDate = Depends(get_mlb_game_date_async),
+    session: AsyncSession = Depends(get_async_db_session),
 ):
-    game_ids = crud.get_all_game_ids_for_date(game_date.date, app)
+    game_ids = await crud.get_all_game_ids_for_date_async(game_date.date, session)
     if not game_ids:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
     return game_ids
@@ -117,33 +123,41 @@ def get_all_game_ids_for_date(
 def get_scoreboard_for_date(
     request: Request, response: Response, game_date: MLBGameDate = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
+    # The scoreboard is built from the combined game data of every game on the date
+    crud.check_season_is_ready(game_date.date.year)
     games_for_date = app.get_scoreboard_data_for_date(game_date.date)
     scoreboard = {"season": game_date.season, "games_for_date": games_for_date}
     return convert_scoreboard_data(scoreboard)
 
 
 @router.get("/pitch_stats_for_date", response_model=List[GamePitchStatsSchema])
-@cache_one_hour()
+@cache()
 def get_daily_pitching_stats(
     request: Request, response: Response, game_date: MLBGameDate = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
-    pitch_stats = app.db_session.query(db.PitchStats).filter_by(date_id=game_date.date_id).all()
-    return [convert_pitch_stats(p, app, game_date.date) for p in pitch_stats]
+    pitch_stats = crud.get_pitch_stats_for_date(game_date.date_id, app)
+    pitcher_records = crud.get_pitcher_records_on_date(game_date.date, app)
+    return [convert_pitch_stats(p, pitcher_records) for p in pitch_stats]
 
 
 @router.get("/bat_stats_for_date", response_model=List[GameBatStatsSchema])
-@cache_one_hour()
-def get_daily_batting_stats(
-    request: Request, response: Response, game_date: MLBGameDate = Depends(), app: Vigorish = Depends(get_vig_app)
+@cache()
+async def get_daily_batting_stats(
+    request: Request,
+    response: Response,
+    game_date: MLBGameDate = Depends(get_mlb_game_date_async),
+    session: AsyncSession = Depends(get_async_db_session),
 ):
-    bat_stats = app.db_session.query(db.BatStats).filter_by(date_id=game_date.date_id).all()
+    bat_stats = await crud.get_bat_stats_for_date_async(game_date.date_id, session)
     return [convert_bat_stats(b) for b in bat_stats]
 
 
 @router.get("/barrels_for_date", response_model=List[PitchFxSchema])
-@cache_one_hour()
+@cache()
 def get_barrels_for_date(
     request: Request, response: Response, game_date: MLBGameDate = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
+    # Each pitch is converted with the combined game data of its game
+    crud.check_season_is_ready(game_date.date.year)
     pfx = app.scraped_data.get_all_barrels_for_game_date(game_date.date)
     return convert_pfx_list(app, pfx)
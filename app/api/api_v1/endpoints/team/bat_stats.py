@@ -2,11 +2,11 @@ from http import HTTPStatus
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
-from fastapi_redis_cache import cache_one_week
 from vigorish.app import Vigorish
 from vigorish.enums import DefensePosition, TeamID
 
 from app.api.dependencies import MLBSeason, TeamParameters
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schema_prep import convert_team_stats
 from app.schemas import CombinedBatStatsSchema
@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=CombinedBatStatsSchema)
-@cache_one_week()
+@cache()
 def get_bat_stats_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -26,7 +26,7 @@ def get_bat_stats_for_team(
 
 
 @router.get("/by_bat_order", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_by_bat_order_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -37,7 +37,7 @@ def get_bat_stats_by_bat_order_for_team(
 
 
 @router.get("/by_position", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_by_defpos_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -48,7 +48,7 @@ def get_bat_stats_by_defpos_for_team(
 
 
 @router.get("/starters", response_model=CombinedBatStatsSchema)
-@cache_one_week()
+@cache()
 def get_bat_stats_for_starters_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -59,7 +59,7 @@ def get_bat_stats_for_starters_for_team(
 
 
 @router.get("/subs", response_model=CombinedBatStatsSchema)
-@cache_one_week()
+@cache()
 def get_bat_stats_for_subs_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -70,7 +70,7 @@ def get_bat_stats_for_subs_for_team(
 
 
 @router.get("/by_year", response_model=Dict[int, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -81,7 +81,7 @@ def get_bat_stats_by_year_for_team(
 
 
 @router.get("/bat_order/by_year", response_model=Dict[int, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_lineup_spot_by_year_for_team(
     request: Request,
     response: Response,
@@ -96,7 +96,7 @@ def get_bat_stats_for_lineup_spot_by_year_for_team(
 
 
 @router.get("/position/by_year", response_model=Dict[int, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_defpos_by_year_for_team(
     request: Request,
     response: Response,
@@ -111,7 +111,7 @@ def get_bat_stats_for_defpos_by_year_for_team(
 
 
 @router.get("/starters/by_year", response_model=Dict[int, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_starters_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -122,7 +122,7 @@ def get_bat_stats_for_starters_by_year_for_team(
 
 
 @router.get("/subs/by_year", response_model=Dict[int, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_subs_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -133,7 +133,7 @@ def get_bat_stats_for_subs_by_year_for_team(
 
 
 @router.get("/by_player", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -145,7 +145,7 @@ def get_bat_stats_by_player_for_team(
 
 
 @router.get("/bat_order/by_player", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_lineup_spot_by_player_for_team(
     request: Request,
     response: Response,
@@ -163,7 +163,7 @@ def get_bat_stats_for_lineup_spot_by_player_for_team(
 
 
 @router.get("/position/by_player", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_defensive_position_by_player_for_team(
     request: Request,
     response: Response,
@@ -181,7 +181,7 @@ def get_bat_stats_for_defensive_position_by_player_for_team(
 
 
 @router.get("/starters/by_player", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_starters_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -193,7 +193,7 @@ def get_bat_stats_for_starters_by_player_for_team(
 
 
 @router.get("/subs/by_player", response_model=List[CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_subs_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -205,7 +205,7 @@ def get_bat_stats_for_subs_by_player_for_team(
 
 
 @router.get("/all_teams", response_model=Dict[str, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -217,7 +217,7 @@ def get_bat_stats_for_season_for_all_teams(
 
 
 @router.get("/bat_order/all_teams", response_model=Dict[str, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_lineup_spot_for_season_for_all_teams(
     request: Request,
     response: Response,
@@ -233,7 +233,7 @@ def get_bat_stats_for_lineup_spot_for_season_for_all_teams(
 
 
 @router.get("/position/all_teams", response_model=Dict[str, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_defpos_for_season_for_all_teams(
     request: Request,
     response: Response,
@@ -249,7 +249,7 @@ def get_bat_stats_for_defpos_for_season_for_all_teams(
 
 
 @router.get("/starters/all_teams", response_model=Dict[str, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_starters_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -261,7 +261,7 @@ def get_bat_stats_for_starters_for_season_for_all_teams(
 
 
 @router.get("/subs/all_teams", response_model=Dict[str, CombinedBatStatsSchema])
-@cache_one_week()
+@cache()
 def get_bat_stats_for_subs_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
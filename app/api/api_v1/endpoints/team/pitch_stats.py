@@ -2,11 +2,11 @@ from http import HTTPStatus
 from typing import Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
-from fastapi_redis_cache import cache_one_week
 from vigorish.app import Vigorish
 from vigorish.enums import TeamID
 
 from app.api.dependencies import MLBSeason, TeamParameters
+from app.core.cache import cache
 from app.core.database import get_vig_app
 from app.schemas import CombinedPitchStatsSchema
 from app.schema_prep import convert_team_stats
@@ -15,7 +15,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -26,7 +26,7 @@ def get_pitch_stats_for_team(
 
 
 @router.get("/sp", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_sp_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -37,7 +37,7 @@ def get_pitch_stats_for_sp_for_team(
 
 
 @router.get("/rp", response_model=CombinedPitchStatsSchema)
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_rp_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -48,7 +48,7 @@ def get_pitch_stats_for_rp_for_team(
 
 
 @router.get("/by_year", response_model=Dict[int, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -59,7 +59,7 @@ def get_pitch_stats_by_year_for_team(
 
 
 @router.get("/sp/by_year", response_model=Dict[int, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_sp_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -70,7 +70,7 @@ def get_pitch_stats_for_sp_by_year_for_team(
 
 
 @router.get("/rp/by_year", response_model=Dict[int, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_rp_by_year_for_team(
     request: Request, response: Response, team_id: TeamID, app: Vigorish = Depends(get_vig_app)
 ):
@@ -81,7 +81,7 @@ def get_pitch_stats_for_rp_by_year_for_team(
 
 
 @router.get("/by_player", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -93,7 +93,7 @@ def get_pitch_stats_by_player_for_team(
 
 
 @router.get("/sp/by_player", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_sp_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -105,7 +105,7 @@ def get_pitch_stats_for_sp_by_player_for_team(
 
 
 @router.get("/rp/by_player", response_model=List[CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_rp_by_player_for_team(
     request: Request, response: Response, team_params: TeamParameters = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -117,7 +117,7 @@ def get_pitch_stats_for_rp_by_player_for_team(
 
 
 @router.get("/all_teams", response_model=Dict[str, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -129,7 +129,7 @@ def get_pitch_stats_for_season_for_all_teams(
 
 
 @router.get("/sp/all_teams", response_model=Dict[str, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_sp_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
@@ -141,7 +141,7 @@ def get_pitch_stats_for_sp_for_season_for_all_teams(
 
 
 @router.get("/rp/all_teams", response_model=Dict[str, CombinedPitchStatsSchema])
-@cache_one_week()
+@cache()
 def get_pitch_stats_for_rp_for_season_for_all_teams(
     request: Request, response: Response, season: MLBSeason = Depends(), app: Vigorish = Depends(get_vig_app)
 ):
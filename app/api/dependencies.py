@@ -1,14 +1,17 @@
+from datetime import datetime
 from http import HTTPStatus
 from typing import Optional
 
 import vigorish.database as db
 from fastapi import Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from vigorish.app import Vigorish
 from vigorish.enums import TeamID
 from vigorish.util.dt_format_strings import DATE_ONLY, DATE_ONLY_TABLE_ID
 from vigorish.util.string_helpers import parse_date, validate_pitch_app_id
 
-from app.core.database import get_vig_app
+from app.core import crud
+from app.core.database import get_async_db_session, get_vig_app
 from app.schema_prep import convert_season_to_dict
 
 
@@ -36,7 +39,9 @@ def get_pitch_app_params(
         )
     result = validate_pitch_app_id(pitch_app_id)
     if result.failure:
-        raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=f"{pitch_app_id} is not a valid pitch app ID")
+        raise HTTPException(
+            status_code=int(HTTPStatus.BAD_REQUEST), detail=f"{pitch_app_id} is not a valid pitch app ID"
+        )
     pitch_app_dict = result.value
     return (pitch_app_dict["pitcher_id"], pitch_app_dict["game_id"])
 
@@ -46,13 +51,22 @@ class MLBSeason:
         season = db.Season.find_by_year(app.db_session, year)
         if not season:
             raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
+        self.set_season(season)
+
+    def __str__(self):
+        return str(self.year)
+
+    def set_season(self, season: db.Season):
         self.year = season.year
         self.start_date = season.start_date
         self.end_date = season.end_date
         self.asg_date = season.asg_date
 
-    def __str__(self):
-        return str(self.year)
+    @classmethod
+    def from_season(cls, season: db.Season):
+        mlb_season = cls.__new__(cls)
+        mlb_season.set_season(season)
+        return mlb_season
 
 
 class MLBGameDate:
@@ -68,13 +82,49 @@ class MLBGameDate:
         result = db.Season.is_date_in_season(app.db_session, parsed_date)
         if result.failure:
             raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=result.error)
-        self.date = parsed_date
-        self.date_id = parsed_date.strftime(DATE_ONLY_TABLE_ID)
-        self.season = convert_season_to_dict(result.value)
+        self.set_date(parsed_date, result.value)
 
     def __str__(self):
         return self.date.strftime(DATE_ONLY)
 
+    def set_date(self, parsed_date: datetime, season: db.Season):
+        self.date = parsed_date
+        self.date_id = parsed_date.strftime(DATE_ONLY_TABLE_ID)
+        self.season = convert_season_to_dict(season)
+
+    @classmethod
+    def from_date(cls, parsed_date: datetime, season: db.Season):
+        game_date = cls.__new__(cls)
+        game_date.set_date(parsed_date, season)
+        return game_date
+
+
+async def get_mlb_season_async(
+    year: int = Query(..., ge=0, le=2022), session: AsyncSession = Depends(get_async_db_session)
+) -> MLBSeason:
+    season = await crud.get_season_async(year, session)
+    if not season:
+        raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail="No results found")
+    return MLBSeason.from_season(season)
+
+
+async def get_mlb_game_date_async(
+    game_date: str = Query(..., description="Date as a string in YYYYMMDD format"),
+    session: AsyncSession = Depends(get_async_db_session),
+) -> MLBGameDate:
+    try:
+        parsed_date = parse_date(game_date)
+    except ValueError as ex:
+        raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=ex.message)
+    season = await crud.get_season_async(parsed_date.year, session)
+    if not season:
+        error = f"Database does not contain info for the MLB {parsed_date.year} Regular Season"
+        raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=error)
+    if parsed_date < season.start_date or parsed_date > season.end_date:
+        error = f"{parsed_date.strftime(DATE_ONLY)} is not within the scope of the {season.name}"
+        raise HTTPException(status_code=int(HTTPStatus.BAD_REQUEST), detail=error)
+    return MLBGameDate.from_date(parsed_date, season)
+
 
 class TeamParameters:
     def __init__(self, team_id: TeamID, season: MLBSeason = Depends()):
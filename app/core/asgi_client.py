@@ -0,0 +1,71 @@
+"""GET requests sent to the app in process, on the running event loop.
+
+The request goes through the app's middleware, dependencies and response cache like one received by the
+server, without opening a connection. Unlike starlette's TestClient, no event loop or thread is created, so
+the response cache, database engines and any other state bound to the server's loop are shared with it.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message
+
+
+@dataclass
+class AsgiResponse:
+    status_code: int = 0
+    headers: Headers = field(default_factory=Headers)
+    content: bytes = b""
+
+    def json(self):
+        return json.loads(self.content)
+
+
+async def send_get_request(
+    app: ASGIApp, url: str, headers: Optional[Dict[str, str]] = None, scope: Optional[Dict[str, object]] = None
+) -> AsgiResponse:
+    (path, _, query_string) = url.partition("?")
+    request_headers = {"host": "localhost", **{name.lower(): value for name, value in (headers or {}).items()}}
+    scope = {
+        **(scope or {}),
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in request_headers.items()],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    response = AsgiResponse()
+    body: List[bytes] = []
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message):
+        if message["type"] == "http.response.start":
+            response.status_code = message["status"]
+            response.headers = Headers(raw=message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware sends a 500 response before raising the exception again
+        if not response.status_code:
+            raise
+    response.content = b"".join(body)
+    return response
@@ -0,0 +1,387 @@
+"""Two-tier response cache: a size-bounded LRU cache in the memory of each worker in front of Redis.
+
+The decorators are drop-in replacements for the ones in fastapi_redis_cache. The response headers
+(X-Vigorish-Cache: Hit/Miss, Expires, Cache-Control, ETag) and the handling of If-None-Match and
+Cache-Control: no-store/no-cache request headers are unchanged. A response found in Redis is kept in the
+local tier until the Redis entry expires or CACHE_L1_MAX_TTL seconds pass, whichever is first.
+
+A response missing from both tiers is computed by a single request (see get_response_single_flight). Keys are
+scoped by route family, season and data version (see app.core.cache_keys), so responses cached before new data
+was installed are never served.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import wraps
+from hashlib import md5
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from fastapi import Request, Response
+from fastapi_redis_cache import FastApiRedisCache
+from fastapi_redis_cache.client import HTTP_TIME
+from fastapi_redis_cache.enums import RedisEvent
+from fastapi_redis_cache.util import deserialize_json, ONE_YEAR_IN_SECONDS, serialize_json
+from redis.exceptions import LockError
+from redis.lock import Lock
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache_keys import CacheInvalidations, get_cache_key, get_route_season
+from app.core.cache_policy import get_cache_policy
+from app.core.config import settings
+from app.data.data_version import data_version
+
+LOCK_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class CacheEntry:
+    data: object
+    etag: str
+    size: int
+    expires_at: float
+    local_expires_at: float
+
+    @property
+    def ttl(self) -> int:
+        return max(int(self.expires_at - time.monotonic()), 0)
+
+
+@dataclass
+class TierStats:
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": round(self.hits / total, 4) if total else 0.0}
+
+
+class LocalCache:
+    """LRU cache of deserialized responses, bounded by the total size of their JSON encoding."""
+
+    def __init__(self, max_bytes: int, max_ttl: int):
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.stats = {"local": TierStats(), "redis": TierStats()}
+        self.coalesced = {"worker": 0, "redis": 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0 and self.max_ttl > 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        if not self.enabled:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry.local_expires_at <= time.monotonic():
+                self.remove(key)
+                entry = None
+            if entry:
+                self.entries.move_to_end(key)
+            self.record("local", entry is not None)
+            return entry
+
+    def set(self, key: str, data: object, serialized: str, ttl: int) -> CacheEntry:
+        now = time.monotonic()
+        entry = CacheEntry(
+            data=data,
+            etag=get_etag(serialized),
+            size=len(serialized),
+            expires_at=now + ttl,
+            local_expires_at=now + min(ttl, self.max_ttl),
+        )
+        if not self.enabled or entry.size > self.max_bytes:
+            return entry
+        with self.lock:
+            self.remove(key)
+            self.entries[key] = entry
+            self.total_bytes += entry.size
+            while self.total_bytes > self.max_bytes:
+                self.remove(next(iter(self.entries)))
+        return entry
+
+    def remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry.size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def record(self, tier: str, hit: bool):
+        if hit:
+            self.stats[tier].hits += 1
+        else:
+            self.stats[tier].misses += 1
+
+    def record_coalesced(self, source: str):
+        with self.lock:
+            self.coalesced[source] += 1
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "local": {
+                **self.stats["local"].as_dict(),
+                "entries": len(self.entries),
+                "size_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            },
+            "redis": {**self.stats["redis"].as_dict(), "connected": FastApiRedisCache().connected},
+            "coalesced": dict(self.coalesced),
+            "data_version": data_version.get(),
+        }
+
+
+local_cache = LocalCache(settings.CACHE_L1_MAX_BYTES, settings.CACHE_L1_MAX_TTL)
+invalidations = CacheInvalidations(settings.CACHE_INVALIDATION_POLL)
+# Responses being computed, by event loop. A future can only be awaited from the loop that created it, and more
+# than one loop can run the app in a process (e.g. the server's and one run by a script in another thread).
+in_flight_requests: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = WeakKeyDictionary()
+in_flight_lock = threading.Lock()
+
+
+def cache(*, expire: Optional[Union[int, timedelta]] = None):
+    """Enable caching behavior for the decorated function.
+
+    Args:
+        expire (Union[int, timedelta], optional): The number of seconds
+            from now when the cached response should expire. Defaults to the
+            TTL chosen by the route's cache policy (see app.core.cache_policy).
+    """
+
+    def outer_wrapper(func):
+        policy = get_cache_policy(func)
+
+        @wraps(func)
+        async def inner_wrapper(*args, **kwargs):
+            func_kwargs = kwargs.copy()
+            request = func_kwargs.pop("request", None)
+            response = func_kwargs.pop("response", None)
+            create_response_directly = not response
+            if create_response_directly:
+                response = Response()
+            redis_cache = FastApiRedisCache()
+            if (
+                not policy.cacheable
+                or not cache_is_available(redis_cache)
+                or redis_cache.request_is_not_cacheable(request)
+            ):
+                return await get_api_response_async(func, *args, **kwargs)
+            redis = redis_cache.redis if redis_cache.connected else None
+            season = get_route_season(func, *args, **kwargs)
+            key = get_cache_key(
+                redis_cache.prefix, redis_cache.ignore_arg_types, invalidations, redis, season, func, *args, **kwargs
+            )
+            entry = local_cache.get(key) or check_redis_cache(redis_cache, key)
+            if entry:
+                set_response_headers(redis_cache, response, True, entry)
+                if resource_not_modified(request, entry.etag):
+                    response.status_code = int(HTTPStatus.NOT_MODIFIED)
+                    return (
+                        Response(
+                            content=None,
+                            status_code=response.status_code,
+                            media_type="application/json",
+                            headers=response.headers,
+                        )
+                        if create_response_directly
+                        else response
+                    )
+                return (
+                    Response(
+                        content=serialize_json(entry.data), media_type="application/json", headers=response.headers
+                    )
+                    if create_response_directly
+                    else entry.data
+                )
+            ttl = calculate_ttl(expire or policy.get_ttl(season))
+            (entry, response_data, cache_hit) = await get_response_single_flight(
+                redis_cache, key, ttl, func, *args, **kwargs
+            )
+            if entry:
+                set_response_headers(redis_cache, response, cache_hit, entry)
+                return (
+                    Response(
+                        content=serialize_json(response_data), media_type="application/json", headers=response.headers
+                    )
+                    if create_response_directly
+                    else response_data
+                )
+            return response_data
+
+        return inner_wrapper
+
+    return outer_wrapper
+
+
+def cache_is_available(redis_cache: FastApiRedisCache) -> bool:
+    # The key prefix and ignored argument types are only set once FastApiRedisCache.init has been called
+    return bool(redis_cache.response_header) and (redis_cache.connected or local_cache.enabled)
+
+
+async def get_response_single_flight(
+    redis_cache: FastApiRedisCache, key: str, ttl: int, func, /, *args, **kwargs
+) -> Tuple[Optional[CacheEntry], object, bool]:
+    """Compute the response for a cache miss once, requests for the same key that arrive meanwhile wait for it.
+
+    Requests handled by this worker wait on the first request's future, requests handled by other workers wait
+    for the holder of the Redis lock for the key to add the response to the cache.
+    """
+    if not settings.CACHE_SINGLE_FLIGHT:
+        return await compute_response(redis_cache, key, ttl, func, *args, **kwargs)
+    requests = get_in_flight_requests()
+    in_flight = requests.get(key)
+    if in_flight:
+        try:
+            (entry, response_data, _) = await asyncio.shield(in_flight)
+            local_cache.record_coalesced("worker")
+            return (entry, entry.data if entry else response_data, True)
+        except asyncio.CancelledError:
+            if not in_flight.cancelled():
+                raise
+    future = asyncio.get_running_loop().create_future()
+    requests[key] = future
+    try:
+        result = await compute_response_with_redis_lock(redis_cache, key, ttl, func, *args, **kwargs)
+        future.set_result(result)
+        return result
+    except Exception as ex:
+        future.set_exception(ex)
+        # Mark the exception as retrieved, it is raised here whether or not other requests are waiting
+        future.exception()
+        raise
+    finally:
+        if not future.done():
+            future.cancel()
+        requests.pop(key, None)
+
+
+def get_in_flight_requests() -> Dict[str, asyncio.Future]:
+    loop = asyncio.get_running_loop()
+    with in_flight_lock:
+        return in_flight_requests.setdefault(loop, {})
+
+
+async def compute_response_with_redis_lock(
+    redis_cache: FastApiRedisCache, key: str, ttl: int, func, /, *args, **kwargs
+) -> Tuple[Optional[CacheEntry], object, bool]:
+    if redis_cache.not_connected:
+        return await compute_response(redis_cache, key, ttl, func, *args, **kwargs)
+    lock = redis_cache.redis.lock(f"{key}:lock", timeout=settings.CACHE_LOCK_TIMEOUT, thread_local=False)
+    if lock.acquire(blocking=False):
+        try:
+            return await compute_response(redis_cache, key, ttl, func, *args, **kwargs)
+        finally:
+            release_lock(lock)
+    entry = await wait_for_redis_cache(redis_cache, key, lock.name)
+    if entry:
+        local_cache.record_coalesced("redis")
+        return (entry, entry.data, True)
+    return await compute_response(redis_cache, key, ttl, func, *args, **kwargs)
+
+
+async def compute_response(
+    redis_cache: FastApiRedisCache, key: str, ttl: int, func, /, *args, **kwargs
+) -> Tuple[Optional[CacheEntry], object, bool]:
+    response_data = await get_api_response_async(func, *args, **kwargs)
+    return (add_to_cache(redis_cache, key, response_data, ttl), response_data, False)
+
+
+async def wait_for_redis_cache(redis_cache: FastApiRedisCache, key: str, lock_name: str) -> Optional[CacheEntry]:
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        entry = check_redis_cache(redis_cache, key, record=False)
+        if entry or not redis_cache.redis.exists(lock_name):
+            return entry
+    return None
+
+
+def release_lock(lock: Lock):
+    try:
+        lock.release()
+    except LockError:
+        # The lock expired while the response was computed and may already be held by another worker
+        pass
+
+
+def check_redis_cache(redis_cache: FastApiRedisCache, key: str, record: bool = True) -> Optional[CacheEntry]:
+    if redis_cache.not_connected:
+        return None
+    ttl, in_cache = redis_cache.check_cache(key)
+    if record:
+        with local_cache.lock:
+            local_cache.record("redis", bool(in_cache))
+    if not in_cache:
+        return None
+    if isinstance(in_cache, bytes):
+        in_cache = in_cache.decode()
+    return local_cache.set(key, deserialize_json(in_cache), in_cache, ttl)
+
+
+def add_to_cache(redis_cache: FastApiRedisCache, key: str, response_data: object, ttl: int) -> Optional[CacheEntry]:
+    try:
+        serialized = serialize_json(response_data)
+    except TypeError:
+        message = f"Object of type {type(response_data)} is not JSON-serializable"
+        redis_cache.log(RedisEvent.FAILED_TO_CACHE_KEY, msg=message, key=key)
+        return None
+    if redis_cache.connected:
+        if not redis_cache.redis.set(name=key, value=serialized, ex=ttl):
+            redis_cache.log(RedisEvent.FAILED_TO_CACHE_KEY, key=key)
+            return None
+        redis_cache.log(RedisEvent.KEY_ADDED_TO_CACHE, key=key)
+    return local_cache.set(key, deserialize_json(serialized), serialized, ttl)
+
+
+def resource_not_modified(request: Request, etag: str) -> bool:
+    return bool(request) and etag_matches(request.headers.get("If-None-Match"), etag)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    check_etags = [check_etag.strip() for check_etag in if_none_match.split(",") if check_etag.strip()]
+    if len(check_etags) == 1 and check_etags[0] == "*":
+        return True
+    return etag in check_etags
+
+
+def get_etag(serialized: str) -> str:
+    # FastApiRedisCache.get_etag uses hash(), which is salted differently in every process, so each worker (and
+    # the snapshot renderer) would send a different ETag for the same response
+    return f'W/"{md5(serialized.encode()).hexdigest()}"'
+
+
+def set_response_headers(redis_cache: FastApiRedisCache, response: Response, cache_hit: bool, entry: CacheEntry):
+    response.headers[redis_cache.response_header] = "Hit" if cache_hit else "Miss"
+    expires_at = datetime.utcnow() + timedelta(seconds=entry.ttl)
+    response.headers["Expires"] = expires_at.strftime(HTTP_TIME)
+    response.headers["Cache-Control"] = f"max-age={entry.ttl}"
+    response.headers["ETag"] = entry.etag
+    if isinstance(entry.data, dict) and "last_modified" in entry.data:
+        response.headers["Last-Modified"] = entry.data["last_modified"]
+
+
+async def get_api_response_async(func, /, *args, **kwargs):
+    # Path operations that are not async run in the threadpool, as they would without the decorator
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+def calculate_ttl(expire: Union[int, timedelta]) -> int:
+    if isinstance(expire, timedelta):
+        expire = int(expire.total_seconds())
+    return min(expire, ONE_YEAR_IN_SECONDS)
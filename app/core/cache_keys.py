@@ -0,0 +1,194 @@
+"""Cache keys scoped by route family, season and data version, and invalidation of cached responses.
+
+Every key has the form {prefix:}{family}:{season}:{data version}:{epoch}:{module.function(args)}. The family is
+the endpoints module a route belongs to (season, team, player, game, pfx, data) and the season is resolved from
+the route's arguments ("all" when a route is not specific to one season). Installing new data changes the
+data version and invalidating a family or season changes the epoch, in both cases requests are served from
+new keys and the old entries are never read again.
+
+Invalidate cached responses from the command line (the changes are seen by every worker within a few seconds):
+
+    python -m app.core.cache_keys invalidate --family team --season 2021
+    python -m app.core.cache_keys invalidate --season 2022
+    python -m app.core.cache_keys purge-stale
+"""
+import argparse
+import inspect
+import os
+import re
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from fastapi_redis_cache.key_gen import get_cache_key as get_route_key
+from redis import Redis
+
+from app.data.data_version import data_version
+
+ENDPOINTS_MODULE = "app.api.api_v1.endpoints."
+ROUTE_FAMILIES = ["data", "game", "pfx", "player", "season", "team"]
+ALL = "all"
+INVALIDATIONS_KEY = "cache:invalidations"
+GAME_ID_REGEX = re.compile(r"[A-Z]{3}(?P<year>\d{4})\d{5}")
+SCAN_BATCH_SIZE = 1000
+
+
+def get_route_family(func) -> str:
+    return func.__module__.replace(ENDPOINTS_MODULE, "").split(".")[0]
+
+
+def get_route_season(func, /, *args, **kwargs) -> Optional[int]:
+    """Find the season a request is for from the resolved values of the route's arguments.
+
+    Parameters are positional-only since route arguments can have any name (e.g. `season`).
+    """
+    bound_args = inspect.signature(func).bind(*args, **kwargs)
+    for value in bound_args.arguments.values():
+        season = get_season_from_value(value)
+        if season:
+            return season
+    return None
+
+
+def get_season_from_value(value) -> Optional[int]:
+    if isinstance(getattr(value, "year", None), int):
+        # MLBSeason, TeamParameters
+        return value.year
+    if isinstance(getattr(value, "date", None), date):
+        # MLBGameDate
+        return value.date.year
+    if isinstance(value, str):
+        # bbref_game_id, at_bat_id
+        match = GAME_ID_REGEX.search(value)
+        return int(match.group("year")) if match else None
+    if isinstance(value, tuple):
+        # (mlb_id, game_id) from get_pitch_app_params, (start, end) from get_date_range
+        seasons = {season for season in (get_season_from_value(item) for item in value) if season}
+        return seasons.pop() if len(seasons) == 1 else None
+    return None
+
+
+class CacheInvalidations:
+    """The number of times cached responses have been invalidated for each route family and season.
+
+    The counters are stored in a Redis hash and only go up (HINCRBY), so every invalidation changes the epoch,
+    even two made in the same second, and an invalidation made by any process applies to every worker. Each
+    worker reads the hash again at most once every `poll_interval` seconds.
+    """
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.invalidated: Dict[str, int] = {}
+
+    def get_epoch(self, redis: Optional[Redis], family: str, season: Optional[int]) -> int:
+        self.sync(redis)
+        families = [ALL, family]
+        if season:
+            return max(self.invalidated.get(f"{f}:{s}", 0) for f in families for s in [ALL, str(season)])
+        # Routes that are not specific to one season (e.g. career stats) include data from every season
+        return max([0] + [epoch for scope, epoch in self.invalidated.items() if scope.split(":")[0] in families])
+
+    def sync(self, redis: Optional[Redis]):
+        now = time.monotonic()
+        if not redis or now - self.checked_at < self.poll_interval:
+            return
+        with self.lock:
+            self.checked_at = now
+            self.invalidated = {decode(scope): int(epoch) for scope, epoch in redis.hgetall(INVALIDATIONS_KEY).items()}
+
+    def invalidate(self, redis: Optional[Redis], family: str = ALL, season: Optional[int] = None) -> int:
+        scope = f"{family}:{season or ALL}"
+        with self.lock:
+            epoch = redis.hincrby(INVALIDATIONS_KEY, scope, 1) if redis else self.invalidated.get(scope, 0) + 1
+            self.invalidated[scope] = epoch
+        return epoch
+
+
+def get_cache_key(
+    prefix: Optional[str],
+    ignore_arg_types: List,
+    invalidations: CacheInvalidations,
+    redis: Optional[Redis],
+    season: Optional[int],
+    func,
+    /,
+    *args,
+    **kwargs,
+) -> str:
+    family = get_route_family(func)
+    scope = f"{family}:{season or ALL}:{data_version.get(season)}:{invalidations.get_epoch(redis, family, season)}"
+    return get_route_key(f"{prefix}:{scope}" if prefix else scope, ignore_arg_types, func, *args, **kwargs)
+
+
+def get_key_patterns(prefix: Optional[str], family: str = ALL, season: Optional[int] = None) -> List[str]:
+    prefix = f"{prefix}:" if prefix else ""
+    families = ROUTE_FAMILIES if family == ALL else [family]
+    seasons = [str(season), ALL] if season else ["*"]
+    return [f"{prefix}{f}:{s}:*" for f in families for s in seasons]
+
+
+def delete_keys(redis: Redis, keys: Iterable[str]) -> int:
+    deleted, batch = 0, []
+    for key in keys:
+        batch.append(key)
+        if len(batch) == SCAN_BATCH_SIZE:
+            deleted += redis.unlink(*batch)
+            batch = []
+    return deleted + (redis.unlink(*batch) if batch else 0)
+
+
+def invalidate(redis: Redis, prefix: Optional[str], family: str = ALL, season: Optional[int] = None) -> int:
+    """Invalidate cached responses for a route family and/or season in every worker and delete them from Redis."""
+    CacheInvalidations(poll_interval=0).invalidate(redis, family, season)
+    keys = (key for pattern in get_key_patterns(prefix, family, season) for key in scan(redis, pattern))
+    return delete_keys(redis, keys)
+
+
+def purge_stale(redis: Redis, prefix: Optional[str]) -> int:
+    """Delete cached responses for data that is no longer installed."""
+    return delete_keys(redis, (key for key in scan(redis, f"{prefix}:*" if prefix else "*") if is_stale(key, prefix)))
+
+
+def is_stale(key: str, prefix: Optional[str]) -> bool:
+    if prefix:
+        key = key[len(prefix) + 1 :]
+    parts = key.split(":", 4)
+    if len(parts) < 5 or parts[0] not in ROUTE_FAMILIES:
+        return False
+    (_, season, version, _, _) = parts
+    if season != ALL and not season.isdigit():
+        return False
+    return version != data_version.get(None if season == ALL else int(season))
+
+
+def scan(redis: Redis, pattern: str) -> Iterable[str]:
+    return (decode(key) for key in redis.scan_iter(match=pattern, count=SCAN_BATCH_SIZE))
+
+
+def decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invalidate cached API responses.")
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL", "redis://127.0.0.1:6379"))
+    parser.add_argument("--prefix", default=None, help="Key prefix passed to FastApiRedisCache.init, if any")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    invalidate_parser = subparsers.add_parser("invalidate", help="Invalidate a route family and/or season")
+    invalidate_parser.add_argument("--family", choices=ROUTE_FAMILIES + [ALL], default=ALL)
+    invalidate_parser.add_argument("--season", type=int, default=None)
+    subparsers.add_parser("purge-stale", help="Delete responses cached for a previous data version")
+    args = parser.parse_args()
+    redis = Redis.from_url(args.redis_url)
+    if args.command == "invalidate":
+        deleted = invalidate(redis, args.prefix, args.family, args.season)
+        print(f"Invalidated family={args.family} season={args.season or ALL}, {deleted} cached responses deleted")
+    else:
+        print(f"{purge_stale(redis, args.prefix)} stale cached responses deleted")
+
+
+if __name__ == "__main__":
+    main()
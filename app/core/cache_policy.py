@@ -0,0 +1,57 @@
+"""Cacheability and time to live of every GET route, decided from the route and the season it is for.
+
+Responses for a completed season only change when new data is installed, which changes their cache key (see
+app.core.cache_keys), so they are kept for a year, the longest TTL the cache allows. Responses for a season in
+progress are kept for CACHE_LIVE_SEASON_TTL seconds. Routes that are not specific to one season (career stats,
+player search) include data from the most recent season and are treated as live while it is in progress.
+
+Policies are registered for each route family, routes that differ from their family are registered by family
+and path operation function name (e.g. "season.get_most_recent_scraped_date").
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional
+
+from fastapi_redis_cache.util import ONE_YEAR_IN_SECONDS
+
+from app.core.cache_keys import get_route_family
+from app.core.config import settings
+from app.data.initialize import MLB_SEASONS
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    cacheable: bool = True
+    completed_season_ttl: int = ONE_YEAR_IN_SECONDS
+    live_season_ttl: int = settings.CACHE_LIVE_SEASON_TTL
+
+    def get_ttl(self, season: Optional[int]) -> int:
+        return self.live_season_ttl if season_in_progress(season) else self.completed_season_ttl
+
+
+SEASON_DATA = CachePolicy()
+NOT_CACHED = CachePolicy(cacheable=False)
+
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    # Status of the data and cache in the worker that handles the request
+    "data": NOT_CACHED,
+    "game": SEASON_DATA,
+    "pfx": SEASON_DATA,
+    "player": SEASON_DATA,
+    "season": SEASON_DATA,
+    "team": SEASON_DATA,
+    # Changes every time a date is scraped while the season is in progress
+    "season.get_most_recent_scraped_date": CachePolicy(live_season_ttl=60),
+}
+
+
+def get_cache_policy(func) -> CachePolicy:
+    family = get_route_family(func)
+    policy = CACHE_POLICIES.get(f"{family}.{func.__name__}") or CACHE_POLICIES.get(family)
+    # Functions outside the API's route families (e.g. benchmarks) are cached like season data
+    return policy or SEASON_DATA
+
+
+def season_in_progress(season: Optional[int]) -> bool:
+    current_year = date.today().year
+    return (season or max(MLB_SEASONS)) >= current_year
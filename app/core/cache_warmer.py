@@ -0,0 +1,118 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from fastapi import FastAPI
+
+from app.core.asgi_client import send_get_request
+from app.core.config import settings
+from app.data.initialize import MLB_SEASONS
+
+
+@dataclass
+class WarmupRequest:
+    path: str
+    params: Dict[str, str] = field(default_factory=dict)
+    status_code: int = 0
+    cache_status: str = ""
+    elapsed_ms: float = 0.0
+    data: object = None
+
+    @property
+    def url(self):
+        query = "&".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{settings.API_VERSION}{self.path}{f'?{query}' if query else ''}"
+
+
+class CacheWarmer:
+    """Request the hottest routes through the app on the server's event loop.
+
+    Path operations that are not async run in the threadpool, so the server keeps handling requests while the
+    cache is warmed.
+    """
+
+    def __init__(self, app: FastAPI, seasons: List[int], max_concurrency: int):
+        self.app = app
+        self.seasons = seasons
+        self.max_concurrency = max(max_concurrency, 1)
+        self.completed: List[WarmupRequest] = []
+        self.task = None
+
+    @property
+    def total_failed(self):
+        return len([req for req in self.completed if req.status_code != 200])
+
+    async def run(self):
+        start = time.perf_counter()
+        print(f"Warming cache for seasons: {', '.join(str(year) for year in self.seasons)}...")
+        season_requests = await self.warm(self.get_season_requests())
+        await self.warm(self.get_scoreboard_requests(season_requests))
+        self.show_results(time.perf_counter() - start)
+
+    def get_season_requests(self):
+        requests = [WarmupRequest("/season/all"), WarmupRequest("/season/most_recent_scraped_date")]
+        for year in self.seasons:
+            params = {"year": year}
+            requests.extend(
+                [
+                    WarmupRequest("/season/all_dates", params),
+                    WarmupRequest("/season/standings", params),
+                    WarmupRequest("/team/batting/all_teams", params),
+                    WarmupRequest("/team/pitching/all_teams", params),
+                ]
+            )
+        return requests
+
+    def get_scoreboard_requests(self, season_requests: List[WarmupRequest]):
+        game_dates = set()
+        for req in season_requests:
+            if req.status_code != 200 or not req.data:
+                continue
+            if req.path == "/season/most_recent_scraped_date":
+                game_dates.add(req.data)
+            if req.path == "/season/all_dates":
+                game_dates.add(req.data[-1])
+        return [
+            WarmupRequest("/season/scoreboard", {"game_date": game_date.replace("-", "")}) for game_date in game_dates
+        ]
+
+    async def warm(self, requests: List[WarmupRequest]):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(self.send_request(req, semaphore) for req in requests))
+
+    async def send_request(self, req: WarmupRequest, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await send_get_request(self.app, req.url)
+                req.status_code = response.status_code
+                req.cache_status = response.headers.get(settings.CACHE_HEADER, "")
+                req.data = response.json() if response.status_code == 200 else None
+            except Exception as ex:
+                req.cache_status = repr(ex)
+            req.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.completed.append(req)
+        print(
+            f"[{len(self.completed)}] {req.url} ({req.status_code or 'ERROR'}, "
+            f"{req.cache_status or 'not cached'}, {req.elapsed_ms:,.0f} ms)"
+        )
+        return req
+
+    def show_results(self, elapsed):
+        print("\n#### CACHE WARMUP RESULTS ####")
+        print(f"Requests...: {len(self.completed)}")
+        print(f"Failed.....: {self.total_failed}")
+        print(f"Cache Hit..: {len([req for req in self.completed if req.cache_status == 'Hit'])}")
+        print(f"Cache Miss.: {len([req for req in self.completed if req.cache_status == 'Miss'])}")
+        print(f"Slowest....: {max((req.elapsed_ms for req in self.completed), default=0):,.0f} ms")
+        print(f"Total Time.: {elapsed:,.2f} s\n")
+
+
+def warm_cache_in_background(app: FastAPI):
+    """Start the warmup as a task on the running event loop (call from a startup event handler)."""
+    seasons = MLB_SEASONS[-settings.CACHE_WARMUP_SEASONS :]
+    cache_warmer = CacheWarmer(app, seasons, settings.CACHE_WARMUP_CONCURRENCY)
+    # The loop only keeps a weak reference to its tasks
+    cache_warmer.task = asyncio.get_running_loop().create_task(cache_warmer.run())
+    return cache_warmer
@@ -8,18 +8,34 @@ from app.data.initialize import initialize
 
 
 class Settings(BaseSettings):
-    initialize()
+    initialize(sync_data=os.environ.get("FAST_START") != "YES")
 
     ENV: str = os.environ.get("ENV")
+    FAST_START: bool = os.environ.get("FAST_START") == "YES"
     API_VERSION: str = os.environ.get("API_VERSION")
     DOTENV_FILE: Path = Path(os.environ.get("DOTENV_FILE"))
     CONFIG_FILE: Path = Path(os.environ.get("CONFIG_FILE"))
     DATABASE_URL: str = os.environ.get("DATABASE_URL")
+    DB_READ_ONLY: bool = os.environ.get("DB_READ_ONLY", "YES" if os.environ.get("ENV") == "PROD" else "NO") == "YES"
+    DB_POOL_SIZE: int = int(os.environ.get("DB_POOL_SIZE", 40))
+    DB_MMAP_SIZE: int = int(os.environ.get("DB_MMAP_SIZE", 1024 * 1024 * 1024))
+    DB_CACHE_SIZE_KB: int = int(os.environ.get("DB_CACHE_SIZE_KB", 64 * 1024))
     SERVER_NAME: Optional[str] = os.environ.get("SERVER_NAME")
     SERVER_HOST: Optional[AnyHttpUrl] = os.environ.get("SERVER_HOST")
     PROJECT_NAME: Optional[str] = os.environ.get("PROJECT_NAME")
     REDIS_URL: RedisDsn = os.environ.get("REDIS_URL")
     CACHE_HEADER: str = os.environ.get("CACHE_HEADER")
+    CACHE_L1_MAX_BYTES: int = int(os.environ.get("CACHE_L1_MAX_BYTES", 64 * 1024 * 1024))
+    CACHE_L1_MAX_TTL: int = int(os.environ.get("CACHE_L1_MAX_TTL", 300))
+    CACHE_SINGLE_FLIGHT: bool = os.environ.get("CACHE_SINGLE_FLIGHT", "YES") == "YES"
+    CACHE_LOCK_TIMEOUT: int = int(os.environ.get("CACHE_LOCK_TIMEOUT", 120))
+    CACHE_LOCK_WAIT: int = int(os.environ.get("CACHE_LOCK_WAIT", 120))
+    CACHE_LIVE_SEASON_TTL: int = int(os.environ.get("CACHE_LIVE_SEASON_TTL", 60 * 60))
+    CACHE_INVALIDATION_POLL: int = int(os.environ.get("CACHE_INVALIDATION_POLL", 5))
+    SNAPSHOT_FOLDER: Path = Path(os.environ.get("SNAPSHOT_FOLDER", Path(__file__).parent.parent / "data" / "snapshots"))
+    CACHE_WARMUP: bool = os.environ.get("CACHE_WARMUP") == "YES"
+    CACHE_WARMUP_SEASONS: int = int(os.environ.get("CACHE_WARMUP_SEASONS", 2))
+    CACHE_WARMUP_CONCURRENCY: int = int(os.environ.get("CACHE_WARMUP_CONCURRENCY", 4))
 
     class Config:
         case_sensitive = True
@@ -1,20 +1,58 @@
-from datetime import date, datetime
+from datetime import date, datetime, time, timedelta, timezone
 from http import HTTPStatus
-from typing import Union
+from typing import Dict, List, Optional, Union
 
 from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from vigorish.app import Vigorish
 from vigorish.data.game_data import GameData
 from vigorish.data.player_data import PlayerData
-from vigorish.database import DateScrapeStatus, Player, Season, Team
+from vigorish.database import (
+    BatStats,
+    DateScrapeStatus,
+    GameScrapeStatus,
+    PitchAppScrapeStatus,
+    PitchFx,
+    PitchStats,
+    Player,
+    Season,
+    Team,
+)
+from vigorish.enums import SeasonType
+from vigorish.util.datetime_util import TIME_ZONE_NEW_YORK
+from vigorish.util.dt_format_strings import DATE_ONLY_TABLE_ID
 from vigorish.util.exceptions import ScrapedDataException, UnknownPlayerException
+from vigorish.util.string_helpers import validate_bbref_game_id
+
+from app.core.config import settings
+from app.data.data_version import data_version
+from app.data.pbp_db import get_pbp_db_path, PlayByPlayDatabase
+from app.data.player_registry import player_registry
+from app.data.standings import standings_registry
+from app.data.season_data import season_data, SeasonDataStatus
+
+SEASON_DATA_RETRY_AFTER = 30
+
+pbp_db = PlayByPlayDatabase(get_pbp_db_path(settings.DATABASE_URL), data_version)
 
 
 def get_player(mlb_id: int, app: Vigorish):
-    try:
-        return Player.find_by_mlb_id(app.db_session, mlb_id)
-    except UnknownPlayerException as ex:
-        raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail=repr(ex))
+    registered = get_registered_player(mlb_id, app)
+    return app.db_session.get(Player, registered.db_player_id)
+
+
+def get_registered_player(mlb_id: Union[int, str], app: Vigorish):
+    player_registry.ensure_loaded(app.db_session)
+    registered = player_registry.get(int(mlb_id)) if str(mlb_id).isdigit() else None
+    if not registered:
+        raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail=repr(UnknownPlayerException(mlb_id)))
+    return registered
+
+
+def get_player_details(mlb_id: Union[int, str], app: Vigorish):
+    return get_registered_player(mlb_id, app).player_details
 
 
 def get_team(team_id_br: str, year: int, app: Vigorish):
@@ -25,19 +63,160 @@ def get_all_game_ids_for_date(game_date: Union[date, datetime], app: Vigorish):
     return DateScrapeStatus.get_all_bbref_game_ids_for_date(app.db_session, game_date)
 
 
+def get_season_standings(year: int, game_date: Union[date, datetime], app: Vigorish):
+    return standings_registry.get_season_standings(app.db_session, year, game_date)
+
+
 def get_all_dates_in_season(year: int, app: Vigorish):
     season = Season.find_by_year(app.db_session, year)
     return season.get_date_range() if season else []
 
 
+def get_pitch_stats_for_date(date_id: str, app: Vigorish) -> List[PitchStats]:
+    query = app.db_session.query(PitchStats).filter_by(date_id=int(date_id))
+    return query.options(joinedload(PitchStats.player)).all()
+
+
+def get_pitcher_records_on_date(game_date: Union[date, datetime], app: Vigorish) -> Dict[int, Dict[str, int]]:
+    """Season-to-date wins, losses and saves for every pitcher who appeared on game_date, keyed by db player id."""
+    date_status = DateScrapeStatus.find_by_date(app.db_session, game_date)
+    if not date_status:
+        return {}
+    pitched_on_date = select(PitchStats.player_id).filter_by(date_id=date_status.id)
+    query = (
+        app.db_session.query(
+            PitchStats.player_id,
+            func.coalesce(func.sum(PitchStats.is_wp), 0),
+            func.coalesce(func.sum(PitchStats.is_lp), 0),
+            func.coalesce(func.sum(PitchStats.is_sv), 0),
+        )
+        .filter(PitchStats.player_id.in_(pitched_on_date))
+        .filter(PitchStats.season_id == date_status.season_id)
+        .filter(PitchStats.date_id <= date_status.id)
+        .group_by(PitchStats.player_id)
+    )
+    return {player_id: {"wins": wins, "losses": losses, "saves": saves} for (player_id, wins, losses, saves) in query}
+
+
+def get_pitch_app_ids_for_pitcher(db_player_id: int, app: Vigorish) -> List[str]:
+    query = app.db_session.query(PitchAppScrapeStatus.pitch_app_id).filter_by(pitcher_id=db_player_id)
+    return [pitch_app_id for (pitch_app_id,) in query]
+
+
+async def get_player_async(mlb_id: int, session: AsyncSession) -> Player:
+    result = await session.execute(select(Player).filter_by(mlb_id=mlb_id))
+    player = result.scalars().first()
+    if not player:
+        raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail=f"No player found with MLB ID: {mlb_id}")
+    return player
+
+
+async def get_season_async(year: int, session: AsyncSession) -> Optional[Season]:
+    result = await session.execute(select(Season).filter_by(season_type=SeasonType.REGULAR_SEASON).filter_by(year=year))
+    return result.scalars().first()
+
+
+async def get_all_regular_seasons_async(session: AsyncSession) -> List[Season]:
+    result = await session.execute(select(Season).filter_by(season_type=SeasonType.REGULAR_SEASON))
+    return result.scalars().all()
+
+
+async def get_all_game_ids_for_date_async(game_date: Union[date, datetime], session: AsyncSession) -> List[str]:
+    date_id = int(game_date.strftime(DATE_ONLY_TABLE_ID))
+    result = await session.execute(
+        select(GameScrapeStatus.bbref_game_id).filter_by(scrape_status_date_id=date_id).order_by(GameScrapeStatus.id)
+    )
+    return result.scalars().all()
+
+
+async def get_all_dates_in_season_async(year: int, session: AsyncSession):
+    season = await get_season_async(year, session)
+    return season.get_date_range() if season else []
+
+
+async def get_bat_stats_for_date_async(date_id: str, session: AsyncSession) -> List[BatStats]:
+    result = await session.execute(
+        select(BatStats).filter_by(date_id=int(date_id)).options(joinedload(BatStats.player))
+    )
+    return result.scalars().all()
+
+
+async def get_pfx_for_batter_in_date_range_async(
+    player_id: int, start_date: datetime, end_date: datetime, session: AsyncSession
+) -> List[PitchFx]:
+    # game_start_time_utc is stored as naive UTC, while the date range is in the local time of the game
+    start = datetime.combine(start_date, time.min, TIME_ZONE_NEW_YORK).astimezone(timezone.utc)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, TIME_ZONE_NEW_YORK).astimezone(timezone.utc)
+    result = await session.execute(
+        select(PitchFx)
+        .filter(PitchFx.batter_id == player_id)
+        .filter(PitchFx.game_start_time_utc >= start.replace(tzinfo=None))
+        .filter(PitchFx.game_start_time_utc < end.replace(tzinfo=None))
+        .order_by(PitchFx.game_start_time_utc, PitchFx.time_pitch_thrown_utc)
+    )
+    return result.scalars().all()
+
+
+def check_season_data_is_ready(bbref_game_id: str) -> Optional[int]:
+    result = validate_bbref_game_id(bbref_game_id)
+    if result.failure:
+        return None
+    year = result.value["game_date"].year
+    check_season_is_ready(year)
+    return year
+
+
+def check_season_is_ready(year: int):
+    status = season_data.request(year)
+    if status == SeasonDataStatus.READY:
+        return
+    detail = (
+        f"Data for the {year} MLB season is not available"
+        if status == SeasonDataStatus.ERROR
+        else f"Data for the {year} MLB season is warming up, please try again shortly"
+    )
+    raise HTTPException(
+        status_code=int(HTTPStatus.SERVICE_UNAVAILABLE),
+        detail=detail,
+        headers={"Retry-After": str(SEASON_DATA_RETRY_AFTER)},
+    )
+
+
 def get_game_data(bbref_game_id: str, app: Vigorish):
+    check_season_data_is_ready(bbref_game_id)
     try:
         return GameData(app, bbref_game_id)
     except ScrapedDataException as ex:
         raise HTTPException(status_code=int(HTTPStatus.NOT_FOUND), detail=repr(ex))
 
 
+def get_all_at_bats_for_game(bbref_game_id: str, app: Vigorish):
+    year = check_season_data_is_ready(bbref_game_id)
+    at_bats = pbp_db.get_all_at_bats_for_game(bbref_game_id, year)
+    if at_bats is not None:
+        return at_bats
+    return get_game_data(bbref_game_id, app).get_all_at_bats_no_pfx()
+
+
+def get_pbp_for_at_bat(at_bat_id: str, bbref_game_id: str, app: Vigorish):
+    year = check_season_data_is_ready(bbref_game_id)
+    at_bat = pbp_db.get_pbp_for_at_bat(at_bat_id, year)
+    if at_bat is not None:
+        return at_bat
+    game_data = get_game_data(bbref_game_id, app)
+    return game_data.get_pbp_for_at_bat(at_bat_id) if at_bat_id in game_data.at_bat_map else None
+
+
+def get_pfx_for_at_bat(at_bat_id: str, bbref_game_id: str, app: Vigorish):
+    year = check_season_data_is_ready(bbref_game_id)
+    pfx = pbp_db.get_pfx_for_at_bat(at_bat_id, year)
+    if pfx is not None:
+        return pfx
+    return get_game_data(bbref_game_id, app).get_pfx_for_at_bat(at_bat_id)
+
+
 def get_player_data(mlb_id: int, app: Vigorish):
+    get_registered_player(mlb_id, app)
     try:
         return PlayerData(app, mlb_id)
     except UnknownPlayerException as ex:
@@ -1,26 +1,102 @@
+import threading
+from contextvars import ContextVar
 from functools import lru_cache
+from itertools import count
+from typing import Optional
 
 from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import scoped_session, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from vigorish.app import Vigorish
 
 from app.core.config import settings
+from app.core.metrics import count_query
+from app.data.season_pack import PackedJsonStorage, season_packs
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+
+def create_db_engine(database_url: str, read_only: bool) -> Engine:
+    if not read_only:
+        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    else:
+        db_file = make_url(database_url).database
+        engine = create_engine(
+            f"sqlite:///file:{db_file}?mode=ro&immutable=1&uri=true",
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=0,
+        )
+        event.listen(engine, "connect", set_read_only_pragmas)
+    event.listen(engine, "before_cursor_execute", count_query)
+    return engine
+
+
+def create_async_db_engine(database_url: str, read_only: bool) -> AsyncEngine:
+    db_file = make_url(database_url).database
+    if not read_only:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    else:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///file:{db_file}?mode=ro&immutable=1&uri=true",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=0,
+        )
+        event.listen(engine.sync_engine, "connect", set_read_only_pragmas)
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+    return engine
+
+
+def set_read_only_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    cursor.execute(f"PRAGMA mmap_size = {settings.DB_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size = -{settings.DB_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.close()
+
+
+engine = create_db_engine(settings.DATABASE_URL, settings.DB_READ_ONLY)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_db_engine(settings.DATABASE_URL, settings.DB_READ_ONLY)
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+request_ids = count(1)
+request_scope: ContextVar[Optional[int]] = ContextVar("request_scope", default=None)
+
 
-def get_db_session():
+def get_session_scope():
+    # Requests are scoped by id so that the same session is used by the event loop and the threadpool
+    return request_scope.get() or threading.get_ident()
+
+
+db_session = scoped_session(SessionLocal, scopefunc=get_session_scope)
+
+
+async def get_db_session():
+    request_scope.set(next(request_ids))
     try:
-        db = SessionLocal()
-        yield db
+        yield db_session
     finally:
-        db.close()
+        db_session.remove()
+
+
+async def get_async_db_session():
+    async with AsyncSessionLocal() as session:
+        yield session
 
 
 @lru_cache
-def get_vig_app(session: Session = Depends(get_db_session)):
-    return Vigorish(dotenv_file=settings.DOTENV_FILE, db_engine=engine, db_session=session)
+def create_vig_app() -> Vigorish:
+    app = Vigorish(dotenv_file=settings.DOTENV_FILE, db_engine=engine, db_session=db_session)
+    app.scraped_data.json_storage = PackedJsonStorage(app.scraped_data.json_storage, season_packs)
+    return app
+
+
+async def get_vig_app(session: Session = Depends(get_db_session)) -> Vigorish:
+    return create_vig_app()
@@ -0,0 +1,44 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+
+# The counter is shared by reference, so queries made in the threadpool are added to the request's total
+query_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = query_counter.get()
+    if counter:
+        counter.count += 1
+
+
+class QueryCountMiddleware:
+    """Report the number of SQL statements executed while handling each request in the X-Query-Count header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = QueryCounter()
+        query_counter.set(counter)
+
+        async def send_with_query_count(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(QUERY_COUNT_HEADER, str(counter.count))
+            await send(message)
+
+        await self.app(scope, receive, send_with_query_count)
@@ -0,0 +1,179 @@
+"""Render the snapshots served by app.core.snapshots.SnapshotMiddleware.
+
+The renderer walks the route table and requests every GET route whose required parameters identify a season
+(year, game_date, game_id, with team_id where needed) for each date, game and team of the seasons given. Each
+200 response is written gzip-compressed to SNAPSHOT_FOLDER and recorded in an index with the data version of its
+season. Routes that need a player ID, at bat ID or date range, or that span every season, are not rendered:
+
+    python -m app.core.snapshot_renderer --seasons 2017 2018 2019 2020 2021 --concurrency 8
+
+Requests are sent to the app in process on a single event loop and go through the response cache, so each
+snapshot is stored with the ETag the cache sends for the same URL.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import time
+from hashlib import md5
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlencode
+
+import vigorish.database as db
+from fastapi import FastAPI
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from fastapi_redis_cache import FastApiRedisCache
+from fastapi_redis_cache.enums import RedisStatus
+from starlette.concurrency import run_in_threadpool
+from vigorish.enums import TeamID
+
+from app.core.asgi_client import AsgiResponse, send_get_request
+from app.core.cache import local_cache
+from app.core.config import settings
+from app.core.snapshots import BYPASS_SCOPE_KEY, get_snapshot_key, Snapshot, SnapshotIndex
+from app.data.data_version import data_version
+from app.data.initialize import MLB_SEASONS
+
+SEASON_PARAMS = ["year", "game_date", "game_id"]
+RENDERED_PARAMS = SEASON_PARAMS + ["team_id"]
+COMPRESS_LEVEL = 9
+
+
+class SnapshotRenderer:
+    def __init__(self, app: FastAPI, folder: Path, seasons: List[int], max_concurrency: int):
+        self.app = app
+        self.index = SnapshotIndex(folder)
+        self.seasons = seasons
+        self.max_concurrency = max(max_concurrency, 1)
+        self.rendered: Dict[str, Snapshot] = {}
+        self.skipped = 0
+
+    @property
+    def routes(self) -> List[APIRoute]:
+        return [route for route in self.app.routes if is_season_route(route)]
+
+    async def run(self):
+        start = time.perf_counter()
+        snapshots = {key: s for key, s in self.index.read().items() if s.season not in self.seasons}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        for year in self.seasons:
+            season_start = time.perf_counter()
+            urls = await self.get_season_urls(year)
+            await asyncio.gather(*(self.render(url, year, semaphore) for url in urls))
+            print(f"{year}: {len(urls):,} routes requested in {time.perf_counter() - season_start:,.1f} s")
+        snapshots.update(self.rendered)
+        self.index.write(snapshots)
+        print("\n#### SNAPSHOTS RENDERED ####")
+        print(f"Rendered...: {len(self.rendered):,}")
+        print(f"Skipped....: {self.skipped:,} (status code other than 200)")
+        print(
+            f"Size.......: {sum(self.index.folder.joinpath(s.file).stat().st_size for s in snapshots.values()):,} bytes"
+        )
+        print(f"Total Time.: {time.perf_counter() - start:,.2f} s\n")
+
+    async def get_season_urls(self, year: int) -> List[str]:
+        game_dates = [d.replace("-", "") for d in await self.get("/season/all_dates", {"year": year}) or []]
+        game_ids = []
+        for game_date in game_dates:
+            game_ids.extend(await self.get("/season/game_ids", {"game_date": game_date}) or [])
+        values = {
+            "year": [year],
+            "game_date": game_dates,
+            "game_id": game_ids,
+            "team_id": await run_in_threadpool(get_team_ids, year),
+        }
+        urls = []
+        for route in self.routes:
+            names = get_required_params(route)
+            for combination in product(*(values[name] for name in names)):
+                urls.append(f"{route.path}?{urlencode(sorted(zip(names, map(str, combination))))}")
+        return urls
+
+    async def get(self, path: str, params: Dict[str, object]):
+        response = await self.send_request(f"{settings.API_VERSION}{path}?{urlencode(params)}")
+        return response.json() if response.status_code == 200 else None
+
+    async def send_request(self, url: str) -> AsgiResponse:
+        return await send_get_request(self.app, url, scope={BYPASS_SCOPE_KEY: True})
+
+    async def render(self, url: str, year: int, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            response = await self.send_request(url)
+        etag = response.headers.get("etag")
+        if response.status_code != 200 or not etag:
+            self.skipped += 1
+            return
+        (path, _, query_string) = url.partition("?")
+        key = get_snapshot_key(path, query_string)
+        file = f"{year}/{md5(key.encode()).hexdigest()}.json.gz"
+        await run_in_threadpool(self.write_file, file, response.content)
+        self.rendered[key] = Snapshot(file, year, data_version.get(year), etag)
+
+    def write_file(self, file: str, content: bytes):
+        file_path = self.index.folder.joinpath(file)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(gzip.compress(content, compresslevel=COMPRESS_LEVEL, mtime=0))
+
+
+def get_team_ids(year: int) -> List[str]:
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        return [
+            t.team_id_br for t in db.Team.get_all_teams_for_season(session, year) if t.team_id_br in TeamID.__members__
+        ]
+    finally:
+        session.close()
+
+
+def is_season_route(route) -> bool:
+    if not isinstance(route, APIRoute) or "GET" not in route.methods or not route.path.startswith(settings.API_VERSION):
+        return False
+    dependant = get_flat_dependant(route.dependant)
+    if dependant.path_params:
+        return False
+    required = get_required_params(route)
+    return (
+        bool(required)
+        and all(name in RENDERED_PARAMS for name in required)
+        and any(name in SEASON_PARAMS for name in required)
+    )
+
+
+def get_required_params(route: APIRoute) -> List[str]:
+    return sorted({param.alias for param in get_flat_dependant(route.dependant).query_params if param.required})
+
+
+async def render_snapshots(app: FastAPI, folder: Path, seasons: List[int], max_concurrency: int):
+    await app.router.startup()
+    try:
+        # Responses go through the in-process cache tier only: they are served from the snapshots, so writing them
+        # to Redis would only take up memory there
+        redis_cache = FastApiRedisCache()
+        (redis_cache.status, redis_cache.redis) = (RedisStatus.NONE, None)
+        await SnapshotRenderer(app, folder, seasons, max_concurrency).run()
+    finally:
+        await app.router.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render responses for completed seasons.")
+    parser.add_argument("--seasons", type=int, nargs="+", default=MLB_SEASONS[:-1])
+    parser.add_argument("--folder", type=Path, default=settings.SNAPSHOT_FOLDER)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    if not local_cache.enabled:
+        parser.error("Snapshots are stored with the ETags sent by the in-process response cache, which is disabled")
+    settings.CACHE_WARMUP = False
+
+    from app.main import app
+
+    asyncio.run(render_snapshots(app, args.folder, args.seasons, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
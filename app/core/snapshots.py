@@ -0,0 +1,142 @@
+"""Pre-rendered responses for completed seasons, served from disk ahead of routing.
+
+Snapshots are written by app.core.snapshot_renderer to SNAPSHOT_FOLDER, with an index that records the data
+version of each snapshot's season and the ETag the response cache sent with it.
+
+SnapshotMiddleware looks up each GET request in the index and sends the file as is (or decompressed for
+clients that do not accept gzip) without running dependencies, vigorish queries, response model validation or
+the response cache. A snapshot is only served while the data version of its season is the one it was rendered
+from, requests for anything else, or sent with Cache-Control: no-store/no-cache, are passed to the app.
+"""
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi_redis_cache.util import ONE_YEAR_IN_SECONDS
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.cache import etag_matches
+from app.core.config import settings
+from app.data.data_version import data_version
+
+INDEX_FILE = "index.json"
+SNAPSHOT_HEADER = "Snapshot"
+# Set in the scope of requests sent by the renderer, which must reach the app even if a snapshot exists
+BYPASS_SCOPE_KEY = "snapshot_bypass"
+CHECK_INTERVAL = 1.0
+
+
+class Snapshot(NamedTuple):
+    file: str
+    season: int
+    data_version: str
+    etag: str
+
+
+def get_snapshot_key(path: str, query_string: str) -> Optional[str]:
+    params = parse_qsl(query_string, keep_blank_values=True)
+    if len({name for name, _ in params}) != len(params):
+        return None
+    return f"{path}?{urlencode(sorted(params))}"
+
+
+class SnapshotIndex:
+    """Snapshots listed in the index file of a folder, read again when the renderer replaces the file."""
+
+    def __init__(self, folder: Path, check_interval: float = CHECK_INTERVAL):
+        self.folder = folder
+        self.index_file = folder.joinpath(INDEX_FILE)
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.modified_at = None
+        self.snapshots: Dict[str, Snapshot] = {}
+
+    def get(self, key: str) -> Optional[Snapshot]:
+        self.check_index_file()
+        snapshot = self.snapshots.get(key)
+        if not snapshot or snapshot.data_version != data_version.get(snapshot.season):
+            return None
+        return snapshot
+
+    def check_index_file(self):
+        now = time.monotonic()
+        if now - self.checked_at < self.check_interval:
+            return
+        with self.lock:
+            self.checked_at = now
+            modified_at = self.index_file.stat().st_mtime_ns if self.index_file.exists() else None
+            if modified_at != self.modified_at:
+                self.modified_at = modified_at
+                self.snapshots = self.read()
+
+    def read(self) -> Dict[str, Snapshot]:
+        if not self.index_file.exists():
+            return {}
+        try:
+            return {key: Snapshot(*entry) for key, entry in json.loads(self.index_file.read_text()).items()}
+        except (ValueError, TypeError):
+            return {}
+
+    def write(self, snapshots: Dict[str, Snapshot]):
+        temp_file = self.index_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps({key: list(snapshot) for key, snapshot in sorted(snapshots.items())}))
+        temp_file.replace(self.index_file)
+
+
+class SnapshotMiddleware:
+    """Serve pre-rendered responses for completed seasons from SNAPSHOT_FOLDER."""
+
+    def __init__(self, app: ASGIApp, folder: Path = None):
+        self.app = app
+        self.index = SnapshotIndex(folder or settings.SNAPSHOT_FOLDER)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        snapshot = self.find_snapshot(scope)
+        if not snapshot:
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        headers = {
+            "content-type": "application/json",
+            "cache-control": f"max-age={ONE_YEAR_IN_SECONDS}",
+            "etag": snapshot.etag,
+            "vary": "Accept-Encoding",
+        }
+        if settings.CACHE_HEADER:
+            headers[settings.CACHE_HEADER.lower()] = SNAPSHOT_HEADER
+        if etag_matches(request_headers.get("if-none-match"), snapshot.etag):
+            await send_response(send, 304, headers, b"")
+            return
+        try:
+            body = await run_in_threadpool(self.index.folder.joinpath(snapshot.file).read_bytes)
+        except OSError:
+            await self.app(scope, receive, send)
+            return
+        if "gzip" in request_headers.get("accept-encoding", ""):
+            headers["content-encoding"] = "gzip"
+        else:
+            body = gzip.decompress(body)
+        await send_response(send, 200, headers, body)
+
+    def find_snapshot(self, scope: Scope) -> Optional[Snapshot]:
+        if scope["type"] != "http" or scope["method"] != "GET" or scope.get(BYPASS_SCOPE_KEY):
+            return None
+        cache_control = Headers(scope=scope).get("cache-control", "")
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return None
+        key = get_snapshot_key(scope["path"], scope["query_string"].decode("latin-1"))
+        return self.index.get(key) if key else None
+
+
+async def send_response(send: Send, status: int, headers: Dict[str, str], body: bytes):
+    headers["content-length"] = str(len(body))
+    raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,66 @@
+import threading
+import time
+from hashlib import md5
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.data.initialize import LOCAL_MANIFEST, MLB_SEASONS, SQLITE_DB
+from app.data.manifest import read_local_manifest
+
+VERSION_LENGTH = 8
+NO_VERSION = "0" * VERSION_LENGTH
+CHECK_INTERVAL = 1.0
+
+
+class DataVersion:
+    """Identifiers of the installed data, derived from the archive hashes in the local manifest.
+
+    The version of a season combines the hashes of vig.db and the season's JSON archive, the version of the
+    data as a whole combines the hashes of every archive. Both change as soon as sync_remote_files installs a
+    new archive and are the same in every worker, since they are read from the manifest on disk.
+    """
+
+    def __init__(self, manifest_file: Path, check_interval: float = CHECK_INTERVAL):
+        self.manifest_file = manifest_file
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.modified_at = None
+        self.versions: Dict[Optional[int], str] = {}
+
+    def get(self, year: Optional[int] = None) -> str:
+        self.check_manifest()
+        return self.versions.get(year) or self.versions.get(None, NO_VERSION)
+
+    def check_manifest(self):
+        now = time.monotonic()
+        if now - self.checked_at < self.check_interval:
+            return
+        with self.lock:
+            self.checked_at = now
+            modified_at = self.manifest_file.stat().st_mtime_ns if self.manifest_file.exists() else None
+            if modified_at == self.modified_at and self.versions:
+                return
+            self.modified_at = modified_at
+            self.versions = get_data_versions(read_local_manifest(self.manifest_file))
+
+    def refresh(self):
+        """Read the manifest again on next use (call after the manifest is updated)."""
+        with self.lock:
+            self.checked_at = 0.0
+            self.modified_at = None
+
+
+def get_data_versions(manifest: Dict[str, str]) -> Dict[Optional[int], str]:
+    db_hash = manifest.get(f"{SQLITE_DB}.zip", "")
+    versions = {None: get_version(*(f"{name}={file_hash}" for name, file_hash in sorted(manifest.items())))}
+    for year in MLB_SEASONS:
+        versions[year] = get_version(db_hash, manifest.get(f"{year}.zip", ""))
+    return versions
+
+
+def get_version(*hashes: str) -> str:
+    return md5("|".join(hashes).encode()).hexdigest()[:VERSION_LENGTH] if any(hashes) else NO_VERSION
+
+
+data_version = DataVersion(LOCAL_MANIFEST)
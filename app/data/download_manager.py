@@ -1,10 +1,13 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from zipfile import ZipFile
 
-from app.data.util import download_file, get_file_name_from_url, validate_file
+from app.data.util import download_file, extract_zip_file, get_file_name_from_url, validate_file
 
 MAX_DOWNLOAD_ATTEMPTS = 5
+MAX_CONCURRENT_DOWNLOADS = 4
+MAX_EXTRACT_WORKERS = 8
 PARTIAL_FILE_ERROR = "Received fewer bytes than expected"
 
 
@@ -13,6 +16,8 @@ class RemoteFileInfo:
     url: str
     hash_url: str
     target_folder: Path
+    extracted_path: Path = None
+    year: int = None
 
     @property
     def zip_filename(self):
@@ -30,8 +35,16 @@ class RemoteFileInfo:
     def hash_filepath(self):
         return self.target_folder.joinpath(self.hash_filename)
 
-    def verify_file_hash(self):
-        return validate_file(self.zip_filepath, self.hash_filepath)
+    @property
+    def is_installed(self):
+        if not self.extracted_path or not self.extracted_path.exists():
+            return False
+        if self.extracted_path.is_file():
+            return True
+        return any(p.is_file() and p.name != ".gitkeep" for p in self.extracted_path.rglob("*"))
+
+    def verify_file_hash(self, md5=None):
+        return validate_file(self.zip_filepath, self.hash_filepath, md5=md5)
 
 
 @dataclass
@@ -42,12 +55,18 @@ class DownloadFileTask:
     error: bool = field(init=False)
     unzipped: bool = field(init=False)
     message: str = field(init=False)
+    extracted_files: int = field(init=False)
+    extracted_bytes: int = field(init=False)
+    md5: str = field(init=False)
 
     def __post_init__(self):
         self.success = False
         self.error = False
         self.unzipped = False
         self.message = ""
+        self.extracted_files = 0
+        self.extracted_bytes = 0
+        self.md5 = ""
 
     @property
     def zip_file(self):
@@ -61,9 +80,12 @@ class DownloadFileTask:
     def attempts_remaining(self):
         return MAX_DOWNLOAD_ATTEMPTS - self.attempts
 
-    def validate_file(self):
-        print(f"Calculating MD5 hash for: {self.zip_file}...")
-        result = self.file_info.verify_file_hash()
+    def validate_file(self, md5=None):
+        if md5:
+            print(f"Verifying MD5 hash calculated during download for: {self.zip_file}...")
+        else:
+            print(f"Calculating MD5 hash for: {self.zip_file}...")
+        result = self.file_info.verify_file_hash(md5)
         if result.success:
             print(f"MD5 hash for {self.zip_file} successfully validated")
         else:
@@ -76,8 +98,18 @@ class DownloadFileTask:
 
 
 class DownloadManager:
-    def __init__(self, files):
+    def __init__(
+        self,
+        files,
+        max_workers: int = MAX_CONCURRENT_DOWNLOADS,
+        extract_workers: int = MAX_EXTRACT_WORKERS,
+        chunk_size: int = None,
+    ):
         self.tasks = [DownloadFileTask(file) for file in files]
+        self.chunk_size = chunk_size
+        self.max_workers = max(max_workers, 1)
+        self.extract_workers = max(extract_workers, 1)
+        self.extract_executor = None
 
     @property
     def remaining_tasks(self):
@@ -92,8 +124,12 @@ class DownloadManager:
         return [task for task in self.tasks if task.error]
 
     @property
-    def ready_to_unzip_tasks(self):
-        return [task for task in self.tasks if task.success and not task.unzipped]
+    def unzipped_tasks(self):
+        return [task for task in self.tasks if task.unzipped]
+
+    @property
+    def installed_files(self):
+        return {task.zip_file: task.md5 for task in self.unzipped_tasks}
 
     @property
     def all_tasks_successfully_complete(self):
@@ -106,24 +142,35 @@ class DownloadManager:
         return f"{len(errors)} {plural} not downloaded successfully:\n{errors}"
 
     def run(self):
-        while self.remaining_tasks:
-            for task in self.remaining_tasks:
-                self.download_files(task)
-        if self.all_tasks_successfully_complete:
-            self.extract_zip_files()
+        with ThreadPoolExecutor(max_workers=self.extract_workers) as executor:
+            self.extract_executor = executor
+            while self.remaining_tasks:
+                if self.max_workers > 1:
+                    self.download_files_concurrently(self.remaining_tasks)
+                else:
+                    for task in self.remaining_tasks:
+                        self.download_files(task)
+        self.extract_executor = None
         self.show_results()
 
+    def download_files_concurrently(self, tasks):
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+            list(executor.map(self.download_files, tasks))
+
     def download_files(self, task):
-        get_file_result = download_file(task.file_info.url, task.file_info.target_folder)
-        get_hash_result = download_file(task.file_info.hash_url, task.file_info.target_folder)
+        md5 = hashlib.md5()
+        get_file_result = download_file(task.file_info.url, task.file_info.target_folder, self.chunk_size, md5)
+        get_hash_result = download_file(task.file_info.hash_url, task.file_info.target_folder, self.chunk_size)
         if get_file_result.success and get_hash_result.success:
-            result = task.validate_file()
+            result = task.validate_file(md5)
             if result.success:
                 task.success = True
+                task.md5 = md5.hexdigest()
+                self.extract_zip_file(task)
             else:
                 task.error = True
                 task.message = result.error
-        elif any(PARTIAL_FILE_ERROR in e for e in [get_file_result.error, get_hash_result.error]):
+        elif any(e and PARTIAL_FILE_ERROR in e for e in [get_file_result.error, get_hash_result.error]):
             task.attempts += 1
             if not task.attempts_remaining:
                 task.error = True
@@ -132,20 +179,29 @@ class DownloadManager:
             task.error = True
             task.message = get_error_messages(get_file_result, get_hash_result, task)
 
-    def extract_zip_files(self):
-        for task in self.ready_to_unzip_tasks:
-            print(f"Extracting contents of zip file: {task.zip_file}...")
-            with ZipFile(task.filepath, mode="r") as zip:
-                zip.extractall(path=task.filepath.parent)
-            task.unzipped = True
-            task.remove_files()
-            print(f"Deleted {task.zip_file} after all contents were extracted.")
+    def extract_zip_file(self, task):
+        print(f"Extracting contents of zip file: {task.zip_file}...")
+        result = extract_zip_file(task.filepath, task.filepath.parent, self.extract_executor, self.extract_workers)
+        if result.failure:
+            task.success = False
+            task.error = True
+            task.message = result.error
+            return
+        (task.extracted_files, task.extracted_bytes) = result.value
+        task.unzipped = True
+        task.remove_files()
+        print(
+            f"Extracted {task.extracted_files:,} files ({task.extracted_bytes:,} bytes) from {task.zip_file}. "
+            f"Deleted {task.zip_file} after all contents were extracted."
+        )
 
     def show_results(self):
         print("\n#### DOWNLOAD RESULTS ####")
         print(f"Success....: {len(self.successful_tasks)}")
         print(f"Error......: {len(self.error_tasks)}")
-        print(f"Remaining..: {len(self.remaining_tasks)}\n")
+        print(f"Remaining..: {len(self.remaining_tasks)}")
+        print(f"Extracted..: {sum(task.extracted_files for task in self.unzipped_tasks):,} files")
+        print(f"Bytes......: {sum(task.extracted_bytes for task in self.unzipped_tasks):,}\n")
         if self.error_tasks:
             print(self.errors)
         if self.all_tasks_successfully_complete:
@@ -156,7 +212,7 @@ class DownloadManager:
 def get_error_messages(get_file_result, get_hash_result, task):
     error_messages = []
     if get_file_result.failure:
-        error_messages.append(f"{get_file_result.error} ({task.zip_filename})")
+        error_messages.append(f"{get_file_result.error} ({task.file_info.zip_filename})")
     if get_hash_result.failure:
-        error_messages.append(f"{get_hash_result.error} ({task.hash_filename})")
+        error_messages.append(f"{get_hash_result.error} ({task.file_info.hash_filename})")
     return "\n".join(error_messages)
@@ -0,0 +1,161 @@
+"""Check that the hot queries issued by the API are served by an index in vig.db.
+
+Each query is run through EXPLAIN QUERY PLAN. Queries that scan their whole table, or use an index
+that covers only some of the filter columns, are reported. With --create the missing indexes are
+added to the local copy of the database:
+
+    python -m app.data.indexes --db app/data/vig.db
+    python -m app.data.indexes --db app/data/vig.db --create
+"""
+import argparse
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Set, Tuple
+
+INDEX_CONSTRAINTS_REGEX = re.compile(r"USING (?:COVERING )?INDEX \S+ \((?P<constraints>[^)]+)\)")
+COLUMN_REGEX = re.compile(r"\s*(?P<column>\w+)")
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    route: str
+    table: str
+    columns: Tuple[str, ...]
+    where: str
+    params: tuple
+
+    @property
+    def sql(self):
+        return f"SELECT * FROM {self.table} WHERE {self.where}"
+
+    @property
+    def index_name(self):
+        return f"ix_{self.table}_{'_'.join(self.columns)}"
+
+
+@dataclass
+class QueryPlanResult:
+    query: HotQuery
+    plan: List[str]
+    error: str = ""
+
+    @property
+    def full_table_scan(self):
+        scans = [f"SCAN {self.query.table}", f"SCAN TABLE {self.query.table}"]
+        return any(step in scans for step in self.plan)
+
+    @property
+    def needs_index(self):
+        # A query that could not be checked is reported as an error, an index is never created for it
+        if self.error or not self.plan:
+            return False
+        # An index that only covers some of the filter columns still leaves rows to be checked one by one
+        searches = [step for step in self.plan if step.startswith("SEARCH")]
+        if any("PRIMARY KEY" in step for step in searches):
+            return False
+        return self.full_table_scan or not any(set(self.query.columns) <= get_index_columns(step) for step in searches)
+
+    @property
+    def status(self):
+        if self.error:
+            return "ERROR"
+        if self.full_table_scan:
+            return "SCAN"
+        return "PARTIAL" if self.needs_index else "OK"
+
+
+def get_index_columns(step: str) -> Set[str]:
+    """Columns constrained by the index in a query plan step.
+
+    For "SEARCH t USING INDEX ix (a=? AND b>? AND b<?)" the columns are {"a", "b"}.
+    """
+    match = INDEX_CONSTRAINTS_REGEX.search(step)
+    if not match:
+        return set()
+    return {COLUMN_REGEX.match(constraint).group("column") for constraint in match.group("constraints").split(" AND ")}
+
+
+HOT_QUERIES = [
+    HotQuery(
+        "/player/batting/pfx/in_date_range",
+        "pitchfx",
+        ("batter_id", "game_start_time_utc"),
+        "batter_id = ? AND game_start_time_utc >= ? AND game_start_time_utc < ?",
+        (0, "2021-07-01 04:00:00", "2021-07-02 04:00:00"),
+    ),
+    HotQuery("/season/bat_stats_for_date", "bat_stats", ("date_id",), "date_id = ?", (20210701,)),
+    HotQuery("/season/pitch_stats_for_date", "pitch_stats", ("date_id",), "date_id = ?", (20210701,)),
+    HotQuery("/season/game_ids", "scrape_status_game", ("scrape_status_date_id",), "scrape_status_date_id = ?", (0,)),
+    HotQuery("/player/pitching/pitch_app_ids", "scrape_status_pitch_app", ("pitcher_id",), "pitcher_id = ?", (0,)),
+    HotQuery("/player/details", "player", ("mlb_id",), "mlb_id = ?", (0,)),
+    HotQuery("/team/pitching/by_player", "player_id", ("mlb_id",), "mlb_id = ?", (0,)),
+]
+
+
+def get_table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def explain_query(conn: sqlite3.Connection, query: HotQuery) -> QueryPlanResult:
+    missing = [col for col in query.columns if col not in get_table_columns(conn, query.table)]
+    if missing:
+        return QueryPlanResult(query, [], f"Table {query.table} has no column(s): {', '.join(missing)}")
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params).fetchall()
+    return QueryPlanResult(query, [row[-1] for row in rows])
+
+
+def check_indexes(conn: sqlite3.Connection, queries: List[HotQuery] = HOT_QUERIES) -> List[QueryPlanResult]:
+    return [explain_query(conn, query) for query in queries]
+
+
+def create_missing_indexes(conn: sqlite3.Connection, results: List[QueryPlanResult]) -> List[str]:
+    created = []
+    for result in results:
+        if result.error or not result.needs_index:
+            continue
+        query = result.query
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {query.index_name} ON {query.table} ({', '.join(query.columns)})")
+        conn.execute(f"ANALYZE {query.index_name}")
+        created.append(query.index_name)
+    conn.commit()
+    return created
+
+
+def report(results: List[QueryPlanResult]):
+    for result in results:
+        print(f"{result.status:<8} {result.query.route:<40} {result.error or ' | '.join(result.plan)}")
+
+
+def ensure_indexes(db_file: Path, create: bool = True, queries: List[HotQuery] = HOT_QUERIES) -> List[QueryPlanResult]:
+    """Report hot queries in db_file that are not fully served by an index and (optionally) index them."""
+    if not db_file.exists():
+        print(f"Unable to check indexes, {db_file} does not exist")
+        return []
+    conn = sqlite3.connect(db_file)
+    try:
+        results = check_indexes(conn, queries)
+        if create and any(result.needs_index for result in results):
+            for index_name in create_missing_indexes(conn, results):
+                print(f"Created index {index_name}")
+            results = check_indexes(conn, queries)
+    finally:
+        conn.close()
+    report(results)
+    return results
+
+
+def main():
+    from app.data.initialize import DATA_FOLDER, SQLITE_DB
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DATA_FOLDER.joinpath(SQLITE_DB), help="Path to vig.db")
+    parser.add_argument("--create", action="store_true", help="Create indexes for queries that need one")
+    args = parser.parse_args()
+    results = ensure_indexes(args.db, args.create)
+    return 1 if any(result.needs_index or result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
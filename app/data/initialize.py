@@ -1,21 +1,62 @@
 import os
 from pathlib import Path
 
-from app.data.download_manager import DownloadManager, RemoteFileInfo
+from app.data.download_manager import DownloadManager, MAX_CONCURRENT_DOWNLOADS, RemoteFileInfo
+from app.data.indexes import ensure_indexes
+from app.data.manifest import (
+    get_changed_remote_files,
+    get_remote_manifest,
+    MANIFEST_FILE,
+    read_local_manifest,
+    update_local_manifest,
+)
+from app.data.season_data import season_data
+from app.data.season_pack import season_packs
 
 MLB_SEASONS = [2017, 2018, 2019, 2020, 2021, 2022]
 S3_BUCKET = "https://vig-api.us-southeast-1.linodeobjects.com"
 SQLITE_DB = "vig.db"
 DATA_FOLDER = Path(__file__).parent
 DOTENV_FILE = DATA_FOLDER.joinpath(".env")
+LOCAL_MANIFEST = DATA_FOLDER.joinpath(MANIFEST_FILE)
 
 
-def initialize():
+def initialize(sync_data: bool = True):
     delete_dotenv_file()
     set_env_variables()
     create_dotenv_file()
-    if os.environ.get("ENV") == "PROD":
-        DownloadManager(get_remote_file_info()).run()
+    if sync_data and os.environ.get("ENV") == "PROD":
+        sync_remote_files()
+
+
+def sync_remote_files():
+    # Imported here since both load vigorish.database, which app.core.config must not do at import
+    from app.data.player_registry import player_registry
+    from app.data.standings import standings_registry
+
+    remote_files = get_remote_file_info()
+    result = get_remote_manifest(f"{S3_BUCKET}/{MANIFEST_FILE}")
+    if result.success:
+        remote_files = get_changed_remote_files(remote_files, result.value, read_local_manifest(LOCAL_MANIFEST))
+    else:
+        print(f"{result.error}\nAll remote files will be downloaded and validated.")
+    if os.environ.get("SEASON_DATA_HYDRATION") == "LAZY":
+        season_data.register([f for f in remote_files if f.year], LOCAL_MANIFEST)
+        remote_files = [f for f in remote_files if not f.year]
+    if remote_files:
+        print(f"Files to download: {', '.join(f.zip_filename for f in remote_files)}")
+        max_workers = int(os.environ.get("MAX_CONCURRENT_DOWNLOADS", MAX_CONCURRENT_DOWNLOADS))
+        download_manager = DownloadManager(remote_files, max_workers=max_workers)
+        download_manager.run()
+        update_local_manifest(LOCAL_MANIFEST, download_manager.installed_files)
+        player_registry.refresh()
+        standings_registry.refresh()
+        for task in download_manager.unzipped_tasks:
+            if task.file_info.year:
+                season_packs.build(task.file_info.year)
+    else:
+        print("All required data files are up to date.")
+    ensure_indexes(DATA_FOLDER.joinpath(SQLITE_DB))
 
 
 def delete_dotenv_file():
@@ -54,12 +95,14 @@ def get_remote_file_info():
             f"{S3_BUCKET}/{SQLITE_DB}.zip",
             f"{S3_BUCKET}/{SQLITE_DB}.zip.md5",
             DATA_FOLDER,
+            DATA_FOLDER.joinpath(SQLITE_DB),
         )
     ]
     for year in MLB_SEASONS:
+        season_folder = DATA_FOLDER.joinpath(f"json/{year}")
         remote_files.append(
             RemoteFileInfo(
-                f"{S3_BUCKET}/{year}.zip", f"{S3_BUCKET}/{year}.zip.md5", DATA_FOLDER.joinpath(f"json/{year}")
+                f"{S3_BUCKET}/{year}.zip", f"{S3_BUCKET}/{year}.zip.md5", season_folder, season_folder, year
             )
         )
     return remote_files
@@ -0,0 +1,82 @@
+"""The manifest of the archives published to the bucket, and of the archives installed from it.
+
+Both map each archive name (vig.db.zip, 2017.zip, ...) to its MD5. After creating the archives, write the
+manifest and the .md5 file of each archive to the folder that is uploaded to the bucket:
+
+    python -m app.data.manifest build path/to/archives
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+from vigorish.util.result import Result
+
+from app.data.util import update_hash_from_file
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_REQUEST_TIMEOUT = 10
+
+
+def get_remote_manifest(url: str) -> Result:
+    try:
+        r = requests.get(url, timeout=MANIFEST_REQUEST_TIMEOUT)
+        r.raise_for_status()
+        return Result.Ok(r.json())
+    except (requests.RequestException, ValueError) as ex:
+        return Result.Fail(f"Unable to retrieve remote manifest ({url}): {repr(ex)}")
+
+
+def read_local_manifest(manifest_file: Path) -> Dict[str, str]:
+    if not manifest_file.exists():
+        return {}
+    try:
+        return json.loads(manifest_file.read_text())
+    except ValueError:
+        return {}
+
+
+def update_local_manifest(manifest_file: Path, installed_files: Dict[str, str]) -> Dict[str, str]:
+    manifest = read_local_manifest(manifest_file)
+    manifest.update(installed_files)
+    manifest_file.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def get_changed_remote_files(remote_files: List, remote_manifest: Dict[str, str], local_manifest: Dict[str, str]):
+    changed_files = []
+    for file_info in remote_files:
+        remote_hash = remote_manifest.get(file_info.zip_filename)
+        if not remote_hash or remote_hash != local_manifest.get(file_info.zip_filename) or not file_info.is_installed:
+            changed_files.append(file_info)
+    return changed_files
+
+
+def build_manifest(folder: Path) -> Dict[str, str]:
+    """Write the manifest of every archive in a folder, and the .md5 file that is downloaded with each archive."""
+    manifest = {}
+    for zip_file in sorted(folder.glob("*.zip")):
+        manifest[zip_file.name] = update_hash_from_file(hashlib.md5(), zip_file).hexdigest()
+        zip_file.with_name(f"{zip_file.name}.md5").write_text(manifest[zip_file.name])
+    folder.joinpath(MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the manifest of the archives published to the bucket.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Hash every .zip file in a folder")
+    build_parser.add_argument("folder", type=Path)
+    args = parser.parse_args()
+    if not any(args.folder.glob("*.zip")):
+        parser.error(f"No .zip files found in {args.folder}")
+    manifest = build_manifest(args.folder)
+    for zip_filename, md5 in manifest.items():
+        print(f"{md5}  {zip_filename}")
+    print(f"Wrote {args.folder.joinpath(MANIFEST_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
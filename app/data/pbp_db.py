@@ -0,0 +1,276 @@
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic.fields import ModelField, SHAPE_SINGLETON
+from sqlalchemy.engine import make_url
+from vigorish.util.exceptions import ScrapedDataException
+
+from app.schemas import AtBatSchema, PitchFxSchema
+from app.schemas.game_data.at_bat import MiscGameEvent, PlayByPlayEvent, PlayerSubEvent
+
+PBP_DB = "pbp.db"
+# Stored in PRAGMA user_version, databases compiled with another layout are rebuilt by compile_seasons
+SCHEMA_VERSION = 2
+SQL_TYPES = {bool: "INTEGER", int: "INTEGER", float: "REAL"}
+
+
+def get_columns(*schemas) -> Dict[str, ModelField]:
+    columns = {}
+    for schema in schemas:
+        for name, field in schema.__fields__.items():
+            columns.setdefault(name, field)
+    return columns
+
+
+# One column for each field of the response schemas, list fields of an at bat (other than its events) are JSON
+AT_BAT_COLUMNS = {name: field for name, field in get_columns(AtBatSchema).items() if name != "pbp_events"}
+EVENT_COLUMNS = get_columns(PlayByPlayEvent, PlayerSubEvent, MiscGameEvent)
+PITCH_COLUMNS = get_columns(PitchFxSchema)
+
+
+def get_column_definitions(columns: Dict[str, ModelField]) -> str:
+    return ",\n    ".join(f"{name} {get_column_type(field)}" for name, field in columns.items())
+
+
+def get_column_type(field: ModelField) -> str:
+    return SQL_TYPES.get(field.type_, "TEXT") if field.shape == SHAPE_SINGLETON else "TEXT"
+
+
+CREATE_TABLES = f"""
+CREATE TABLE IF NOT EXISTS at_bat (
+    game_id TEXT NOT NULL,
+    at_bat_index INTEGER NOT NULL,
+    is_valid INTEGER NOT NULL,
+    {get_column_definitions(AT_BAT_COLUMNS)},
+    PRIMARY KEY (at_bat_id)
+);
+CREATE INDEX IF NOT EXISTS ix_at_bat_game_id ON at_bat (game_id, at_bat_index);
+CREATE TABLE IF NOT EXISTS pbp_event (
+    game_id TEXT NOT NULL,
+    event_index INTEGER NOT NULL,
+    {get_column_definitions(EVENT_COLUMNS)},
+    PRIMARY KEY (at_bat_id, event_index)
+);
+CREATE INDEX IF NOT EXISTS ix_pbp_event_game_id ON pbp_event (game_id, at_bat_id);
+CREATE TABLE IF NOT EXISTS pitch (
+    game_id TEXT NOT NULL,
+    pitch_index INTEGER NOT NULL,
+    {get_column_definitions(PITCH_COLUMNS)},
+    PRIMARY KEY (at_bat_id, pitch_index)
+);
+CREATE INDEX IF NOT EXISTS ix_pitch_game_id ON pitch (game_id, at_bat_id);
+CREATE TABLE IF NOT EXISTS season (
+    year INTEGER PRIMARY KEY,
+    data_version TEXT NOT NULL
+);
+"""
+TABLES = ["at_bat", "pbp_event", "pitch", "season"]
+# Rows are only read while the season was compiled from the data version that is installed
+SEASON_IS_CURRENT = "EXISTS (SELECT 1 FROM season WHERE year = ? AND data_version = ?)"
+
+
+def get_pbp_db_path(database_url: str) -> Path:
+    return Path(make_url(database_url).database).with_name(PBP_DB)
+
+
+def encode_row(columns: Dict[str, ModelField], values: dict, **keys) -> Dict[str, object]:
+    return {**keys, **{name: encode_value(field, values.get(name)) for name, field in columns.items()}}
+
+
+def encode_value(field: ModelField, value):
+    if value is None:
+        return None
+    if field.shape != SHAPE_SINGLETON:
+        return json.dumps(value)
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def decode_row(columns: Dict[str, ModelField], row: sqlite3.Row) -> dict:
+    return {name: decode_value(field, row[name]) for name, field in columns.items()}
+
+
+def decode_value(field: ModelField, value):
+    if value is None:
+        return None
+    if field.shape != SHAPE_SINGLETON:
+        return json.loads(value)
+    if field.type_ is bool:
+        return bool(value)
+    return datetime.fromisoformat(value) if field.type_ is datetime else value
+
+
+def decode_event(row: sqlite3.Row) -> dict:
+    # Each event type has its own fields, the columns of the other types are NULL
+    return {name: value for name, value in decode_row(EVENT_COLUMNS, row).items() if value is not None}
+
+
+def select_columns(columns: Dict[str, ModelField]) -> str:
+    return ", ".join(columns)
+
+
+class PlayByPlayDatabase:
+    """Read-only access to the at bat, play-by-play event and pitch tables compiled from combined game data.
+
+    Every lookup returns None when the database (or the requested game) has not been compiled, or when the
+    season was compiled from a different data version than the one installed, so callers can fall back to
+    loading the game through GameData.
+    """
+
+    def __init__(self, db_file: Path, data_version):
+        self.db_file = db_file
+        self.data_version = data_version
+        self.local = threading.local()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        conn = getattr(self.local, "conn", None)
+        if not conn and self.db_file.exists():
+            conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self.local.conn = conn
+        return conn
+
+    def query(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        if not self.conn:
+            return []
+        try:
+            return self.conn.execute(sql, params).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def query_season(self, year: Optional[int], sql: str, params: tuple, order_by: str = "") -> List[sqlite3.Row]:
+        if not year:
+            return []
+        sql = f"{sql} AND {SEASON_IS_CURRENT}"
+        if order_by:
+            sql = f"{sql} ORDER BY {order_by}"
+        return self.query(sql, params + (year, self.data_version.get(year)))
+
+    def get_all_at_bats_for_game(self, game_id: str, year: Optional[int]) -> Optional[List[dict]]:
+        sql = f"SELECT {select_columns(AT_BAT_COLUMNS)} FROM at_bat WHERE game_id = ? AND is_valid = 1"
+        rows = self.query_season(year, sql, (game_id,), order_by="at_bat_index")
+        if not rows:
+            return None
+        at_bats = {row["at_bat_id"]: {**decode_row(AT_BAT_COLUMNS, row), "pbp_events": []} for row in rows}
+        sql = f"SELECT {select_columns(EVENT_COLUMNS)} FROM pbp_event WHERE game_id = ? ORDER BY at_bat_id, event_index"
+        for row in self.query(sql, (game_id,)):
+            if row["at_bat_id"] in at_bats:
+                at_bats[row["at_bat_id"]]["pbp_events"].append(decode_event(row))
+        return list(at_bats.values())
+
+    def get_pbp_for_at_bat(self, at_bat_id: str, year: Optional[int]) -> Optional[dict]:
+        sql = f"SELECT {select_columns(AT_BAT_COLUMNS)} FROM at_bat WHERE at_bat_id = ?"
+        rows = self.query_season(year, sql, (at_bat_id,))
+        if not rows:
+            return None
+        sql = f"SELECT {select_columns(EVENT_COLUMNS)} FROM pbp_event WHERE at_bat_id = ? ORDER BY event_index"
+        return {
+            **decode_row(AT_BAT_COLUMNS, rows[0]),
+            "pbp_events": list(map(decode_event, self.query(sql, (at_bat_id,)))),
+        }
+
+    def get_pfx_for_at_bat(self, at_bat_id: str, year: Optional[int]) -> Optional[List[dict]]:
+        sql = f"SELECT {select_columns(PITCH_COLUMNS)} FROM pitch WHERE at_bat_id = ?"
+        rows = self.query_season(year, sql, (at_bat_id,), order_by="pitch_index")
+        if rows:
+            return [decode_row(PITCH_COLUMNS, row) for row in rows]
+        # At bats without pitchfx data have no pitch rows, but are compiled all the same
+        return [] if self.query_season(year, "SELECT 1 FROM at_bat WHERE at_bat_id = ?", (at_bat_id,)) else None
+
+
+def compile_game(conn: sqlite3.Connection, game_data):
+    game_id = game_data.bbref_game_id
+    valid_at_bat_ids = {at_bat["at_bat_id"] for at_bat in game_data.valid_at_bats}
+    for table in ["at_bat", "pbp_event", "pitch"]:
+        conn.execute(f"DELETE FROM {table} WHERE game_id = ?", (game_id,))
+    for at_bat_index, at_bat_id in enumerate(game_data.at_bat_map):
+        pbp = game_data.get_pbp_for_at_bat(at_bat_id)
+        keys = {"game_id": game_id, "at_bat_index": at_bat_index, "is_valid": at_bat_id in valid_at_bat_ids}
+        insert_rows(conn, "at_bat", [encode_row(AT_BAT_COLUMNS, pbp, **keys)])
+        events = [
+            encode_row(EVENT_COLUMNS, event, game_id=game_id, event_index=event_index)
+            for event_index, event in enumerate(pbp.get("pbp_events", []))
+        ]
+        insert_rows(conn, "pbp_event", events)
+        pitches = [
+            encode_row(PITCH_COLUMNS, pitch, game_id=game_id, pitch_index=pitch_index)
+            for pitch_index, pitch in enumerate(game_data.get_pfx_for_at_bat(at_bat_id))
+        ]
+        insert_rows(conn, "pitch", pitches)
+
+
+def insert_rows(conn: sqlite3.Connection, table: str, rows: List[Dict[str, object]]):
+    if not rows:
+        return
+    columns = list(rows[0])
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(f':{name}' for name in columns)})"
+    conn.executemany(sql, rows)
+
+
+def create_tables(conn: sqlite3.Connection):
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        for table in TABLES + ["at_bat_pitchfx"]:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(CREATE_TABLES)
+
+
+def clear_season(conn: sqlite3.Connection, year: int):
+    conn.execute("DELETE FROM season WHERE year = ?", (year,))
+    for table in ["at_bat", "pbp_event", "pitch"]:
+        conn.execute(f"DELETE FROM {table} WHERE substr(game_id, 4, 4) = ?", (str(year),))
+
+
+def compile_seasons(app, json_folder: Path, db_file: Path, years: List[int], data_version):
+    from vigorish.data.game_data import GameData
+
+    conn = sqlite3.connect(db_file)
+    create_tables(conn)
+    for year in years:
+        # The version is read before the games, a season installed while compiling is never marked current
+        version = data_version.get(year)
+        with conn:
+            clear_season(conn, year)
+        game_ids = sorted(
+            f.stem.removesuffix("_COMBINED_DATA") for f in json_folder.joinpath(f"{year}/combined_data").glob("*.json")
+        )
+        compiled = 0
+        for game_id in game_ids:
+            try:
+                game_data = GameData(app, game_id)
+            except ScrapedDataException as ex:
+                print(f"Skipping {game_id}: {repr(ex)}")
+                continue
+            with conn:
+                compile_game(conn, game_data)
+            compiled += 1
+        with conn:
+            conn.execute("INSERT INTO season VALUES (?, ?)", (year, version))
+        print(f"{year}: compiled play-by-play data for {compiled} games")
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def main(years: List[int]):
+    from app.core.config import settings
+    from app.core.database import create_vig_app, db_session
+    from app.data.data_version import data_version
+    from app.data.initialize import DATA_FOLDER
+
+    db_file = get_pbp_db_path(settings.DATABASE_URL)
+    try:
+        compile_seasons(create_vig_app(), DATA_FOLDER.joinpath("json"), db_file, years, data_version)
+    finally:
+        db_session.remove()
+    print(f"Play-by-play data written to {db_file}")
+
+
+if __name__ == "__main__":
+    from app.data.initialize import MLB_SEASONS
+
+    main([int(arg) for arg in sys.argv[1:]] or MLB_SEASONS)
@@ -0,0 +1,132 @@
+import threading
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import vigorish.database as db
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+PLAYER_DETAILS_EXCLUDE = [
+    "id",
+    "retro_id",
+    "scraped_transactions",
+    "minor_league_player",
+    "missing_mlb_id",
+    "add_to_db_backup",
+]
+FIRST_SEASON_WITH_TEAM_DATA = 2017
+
+
+@dataclass
+class RegisteredPlayer:
+    db_player_id: int
+    mlb_id: int
+    bbref_id: str
+    name_first: str
+    name_last: str
+    bats: str
+    throws: str
+    birth_date: Optional[datetime]
+    details: Dict[str, object]
+    all_teams: List[Dict[str, object]] = field(default_factory=list)
+
+    @property
+    def name(self):
+        return f"{self.name_first} {self.name_last}"
+
+    @property
+    def player_details(self):
+        return deepcopy({**self.details, "all_teams": self.all_teams})
+
+
+class PlayerRegistry:
+    """Player identity, names, birth dates and team history, loaded from vig.db once per process.
+
+    Lookups return None until the registry has been loaded, so callers can fall back to the database.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_mlb_id: Dict[int, RegisteredPlayer] = {}
+        self.by_db_player_id: Dict[int, RegisteredPlayer] = {}
+        self.loaded = False
+
+    def ensure_loaded(self, db_session: Session):
+        if not self.loaded:
+            self.load(db_session)
+
+    def load(self, db_session: Session):
+        with self.lock:
+            if self.loaded:
+                return
+            by_mlb_id = {}
+            by_db_player_id = {}
+            for player in db_session.query(db.Player).filter(db.Player.mlb_id.isnot(None)):
+                registered = create_registered_player(player)
+                by_mlb_id[player.mlb_id] = registered
+                by_db_player_id[player.id] = registered
+            team_assoc_list = (
+                db_session.query(db.Assoc_Player_Team)
+                .filter(db.Assoc_Player_Team.year >= FIRST_SEASON_WITH_TEAM_DATA)
+                .order_by(db.Assoc_Player_Team.year)
+                .order_by(db.Assoc_Player_Team.stint_number)
+            )
+            for team in team_assoc_list:
+                if team.db_player_id in by_db_player_id:
+                    by_db_player_id[team.db_player_id].all_teams.append(team.as_dict())
+            self.by_mlb_id = by_mlb_id
+            self.by_db_player_id = by_db_player_id
+            self.loaded = True
+
+    def warm(self, session_factory):
+        session = session_factory()
+        try:
+            self.ensure_loaded(session)
+        except SQLAlchemyError as ex:
+            print(f"Unable to load player registry: {repr(ex)}")
+        finally:
+            session.close()
+
+    def refresh(self):
+        """Discard the loaded players, the registry is reloaded on next use (call when vig.db is replaced)."""
+        with self.lock:
+            self.by_mlb_id = {}
+            self.by_db_player_id = {}
+            self.loaded = False
+
+    def get(self, mlb_id: int) -> Optional[RegisteredPlayer]:
+        return self.by_mlb_id.get(mlb_id)
+
+    def get_by_db_player_id(self, db_player_id: int) -> Optional[RegisteredPlayer]:
+        return self.by_db_player_id.get(db_player_id)
+
+    def get_name(self, db_player_id: int) -> Optional[str]:
+        player = self.by_db_player_id.get(db_player_id)
+        return player.name if player else None
+
+
+def create_registered_player(player: db.Player) -> RegisteredPlayer:
+    details = player.as_dict()
+    for key in PLAYER_DETAILS_EXCLUDE:
+        details.pop(key)
+    birth_date = (
+        datetime(player.birth_year, player.birth_month, player.birth_day)
+        if player.birth_year and player.birth_month and player.birth_day
+        else None
+    )
+    return RegisteredPlayer(
+        db_player_id=player.id,
+        mlb_id=player.mlb_id,
+        bbref_id=player.bbref_id,
+        name_first=player.name_first,
+        name_last=player.name_last,
+        bats=player.bats,
+        throws=player.throws,
+        birth_date=birth_date,
+        details=details,
+    )
+
+
+player_registry = PlayerRegistry()
@@ -0,0 +1,135 @@
+import fcntl
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.data.download_manager import DownloadManager, RemoteFileInfo
+from app.data.manifest import read_local_manifest, update_local_manifest
+from app.data.season_pack import season_packs
+
+
+class SeasonDataStatus(str, Enum):
+    PENDING = "pending"
+    DOWNLOADING = "downloading"
+    READY = "ready"
+    ERROR = "error"
+
+
+@dataclass
+class SeasonData:
+    file_info: RemoteFileInfo
+    status: SeasonDataStatus = SeasonDataStatus.PENDING
+    message: str = field(default="")
+    # Hash of the archive in the local manifest when the season was registered
+    installed_hash: str = field(default="")
+
+    @property
+    def year(self):
+        return self.file_info.year
+
+
+class SeasonDataManager:
+    """Seasons whose JSON archives are downloaded after startup (SEASON_DATA_HYDRATION=LAZY).
+
+    Seasons are registered when the data is synced, which happens in the gunicorn master before the workers are
+    forked, and are hydrated by every process that serves requests (start hydrate_in_background in the startup
+    event). A lock file next to the manifest lets one process download a season while the others wait and find
+    it installed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seasons: Dict[int, SeasonData] = {}
+        self.manifest_file: Path = None
+
+    @property
+    def all_seasons_ready(self):
+        return all(season.status == SeasonDataStatus.READY for season in self.seasons.values())
+
+    def register(self, remote_files: List[RemoteFileInfo], manifest_file: Path):
+        self.manifest_file = manifest_file
+        manifest = read_local_manifest(manifest_file)
+        with self.lock:
+            for file_info in remote_files:
+                self.seasons[file_info.year] = SeasonData(
+                    file_info, installed_hash=manifest.get(file_info.zip_filename, "")
+                )
+
+    def get_status(self, year: int) -> SeasonDataStatus:
+        season = self.seasons.get(year)
+        return season.status if season else SeasonDataStatus.READY
+
+    def request(self, year: int) -> SeasonDataStatus:
+        if self.get_status(year) == SeasonDataStatus.READY:
+            return SeasonDataStatus.READY
+        if self.claim(year):
+            threading.Thread(target=self.hydrate, args=(year,), daemon=True).start()
+        return self.get_status(year)
+
+    def hydrate_in_background(self):
+        threading.Thread(target=self.hydrate_all, daemon=True).start()
+
+    def hydrate_all(self):
+        for year in sorted(self.seasons, reverse=True):
+            if self.claim(year):
+                self.hydrate(year)
+
+    def claim(self, year: int) -> bool:
+        with self.lock:
+            season = self.seasons.get(year)
+            if not season or season.status != SeasonDataStatus.PENDING:
+                return False
+            season.status = SeasonDataStatus.DOWNLOADING
+            return True
+
+    def hydrate(self, year: int):
+        season = self.seasons[year]
+        try:
+            with hydration_lock(self.manifest_file):
+                (status, message) = self.install(season)
+        except Exception as ex:
+            (status, message) = (SeasonDataStatus.ERROR, repr(ex))
+        with self.lock:
+            season.status = status
+            season.message = message
+
+    def install(self, season: SeasonData) -> Tuple[SeasonDataStatus, str]:
+        if self.installed_by_another_process(season):
+            season_packs.discard(season.year)
+            return (SeasonDataStatus.READY, "")
+        download_manager = DownloadManager([season.file_info], max_workers=1)
+        download_manager.run()
+        if not download_manager.all_tasks_successfully_complete:
+            return (SeasonDataStatus.ERROR, "\n".join(task.message for task in download_manager.error_tasks))
+        # Building the pack reads every JSON file of the season, requests for the status of other seasons must
+        # not wait for it
+        season_packs.build(season.year)
+        with self.lock:
+            update_local_manifest(self.manifest_file, download_manager.installed_files)
+        return (SeasonDataStatus.READY, "")
+
+    def installed_by_another_process(self, season: SeasonData) -> bool:
+        installed_hash = read_local_manifest(self.manifest_file).get(season.file_info.zip_filename, "")
+        return installed_hash != season.installed_hash and season.file_info.is_installed
+
+    def report(self):
+        return [
+            {"year": season.year, "status": season.status.value, "message": season.message}
+            for season in sorted(self.seasons.values(), key=lambda x: x.year)
+        ]
+
+
+@contextmanager
+def hydration_lock(manifest_file: Path):
+    with open(manifest_file.with_suffix(".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+season_data = SeasonDataManager()
@@ -0,0 +1,152 @@
+import json
+import mmap
+import struct
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from vigorish.util.dt_format_strings import HTTP_TIME
+
+PACK_MAGIC = b"VIGPACK1"
+PACK_FOOTER = struct.Struct("<QQ")
+COMBINED_DATA = "combined_data"
+COMBINED_DATA_SUFFIX = "_COMBINED_DATA"
+
+
+def get_pack_file(season_folder: Path) -> Path:
+    return season_folder.joinpath(f"{season_folder.name}.pack")
+
+
+def get_pack_key(data_set: str, url_id: str) -> str:
+    return f"{data_set}/{url_id}"
+
+
+def build_season_pack(season_folder: Path) -> Optional[Path]:
+    """Compile every JSON file in a season folder into a single pack file.
+
+    The pack contains the raw JSON documents back to back, followed by an index that maps
+    "{data_set}/{url_id}" to the offset, length and last-modified time of each document.
+    The last 16 bytes of the file hold the offset and length of the index.
+    """
+    json_files = sorted(season_folder.glob("*/*.json"))
+    if not json_files:
+        return None
+    pack_file = get_pack_file(season_folder)
+    temp_file = pack_file.with_suffix(".pack.tmp")
+    index: Dict[str, List] = {}
+    with open(temp_file, "wb") as pack:
+        pack.write(PACK_MAGIC)
+        for json_file in json_files:
+            data = json_file.read_bytes()
+            url_id = json_file.stem.removesuffix(COMBINED_DATA_SUFFIX)
+            last_modified = datetime.fromtimestamp(json_file.stat().st_mtime, tz=timezone.utc).strftime(HTTP_TIME)
+            index[get_pack_key(json_file.parent.name, url_id)] = [pack.tell(), len(data), last_modified]
+            pack.write(data)
+        index_offset = pack.tell()
+        index_data = json.dumps(index, separators=(",", ":")).encode()
+        pack.write(index_data)
+        pack.write(PACK_FOOTER.pack(index_offset, len(index_data)))
+    temp_file.replace(pack_file)
+    return pack_file
+
+
+class SeasonPack:
+    def __init__(self, pack_file: Path):
+        self.pack_file = pack_file
+        self.file = open(pack_file, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[: len(PACK_MAGIC)] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{pack_file} is not a valid season pack file")
+        index_offset, index_length = PACK_FOOTER.unpack(self.mm[-PACK_FOOTER.size :])
+        self.index: Dict[str, List] = json.loads(self.mm[index_offset : index_offset + index_length])
+
+    def __contains__(self, key: str):
+        return key in self.index
+
+    def get(self, data_set: str, url_id: str) -> Optional[dict]:
+        entry = self.index.get(get_pack_key(data_set, url_id))
+        if not entry:
+            return None
+        offset, length, last_modified = entry
+        json_dict = json.loads(self.mm[offset : offset + length])
+        if data_set == COMBINED_DATA:
+            json_dict["last_modified"] = last_modified
+        return json_dict
+
+    def close(self):
+        self.mm.close()
+        self.file.close()
+
+
+class SeasonPackRegistry:
+    def __init__(self, json_folder: Path):
+        self.json_folder = json_folder
+        self.lock = threading.Lock()
+        self.packs: Dict[int, Optional[SeasonPack]] = {}
+
+    def get_pack(self, year: int) -> Optional[SeasonPack]:
+        if year in self.packs:
+            return self.packs[year]
+        with self.lock:
+            if year not in self.packs:
+                pack_file = get_pack_file(self.json_folder.joinpath(str(year)))
+                self.packs[year] = SeasonPack(pack_file) if pack_file.exists() else None
+            return self.packs[year]
+
+    def get_combined_game_data(self, bbref_game_id: str) -> Optional[dict]:
+        # Imported here since it loads vigorish.enums, which app.data.initialize must not do at import
+        from vigorish.util.string_helpers import validate_bbref_game_id
+
+        result = validate_bbref_game_id(bbref_game_id)
+        if result.failure:
+            return None
+        pack = self.get_pack(result.value["game_date"].year)
+        return pack.get(COMBINED_DATA, bbref_game_id) if pack else None
+
+    def build(self, year: int) -> Optional[Path]:
+        with self.lock:
+            self.discard(year)
+            return build_season_pack(self.json_folder.joinpath(str(year)))
+
+    def discard(self, year: int):
+        """Close the pack for a season, it is opened again on next use (e.g. after another process rebuilt it)."""
+        pack = self.packs.pop(year, None)
+        if pack:
+            pack.close()
+
+
+class PackedJsonStorage:
+    """Serves combined game data from a season pack, falling back to the wrapped JsonStorage."""
+
+    def __init__(self, json_storage, season_packs: SeasonPackRegistry):
+        self.json_storage = json_storage
+        self.season_packs = season_packs
+
+    def __getattr__(self, name):
+        return getattr(self.json_storage, name)
+
+    def get_combined_game_data(self, bbref_game_id):
+        json_dict = self.season_packs.get_combined_game_data(bbref_game_id)
+        return json_dict if json_dict else self.json_storage.get_combined_game_data(bbref_game_id)
+
+
+season_packs = SeasonPackRegistry(Path(__file__).parent.joinpath("json"))
+
+
+def main(years: List[int]):
+    for year in years:
+        pack_file = season_packs.build(year)
+        if not pack_file:
+            print(f"No JSON files found for the {year} MLB season, skipping")
+            continue
+        pack = season_packs.get_pack(year)
+        print(f"{pack_file}: {len(pack.index)} documents ({pack_file.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    from app.data.initialize import MLB_SEASONS
+
+    main([int(arg) for arg in sys.argv[1:]] or MLB_SEASONS)
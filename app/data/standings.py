@@ -0,0 +1,135 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from itertools import groupby
+from typing import Dict, List, Tuple, Union
+
+import vigorish.database as db
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from vigorish.util.dt_format_strings import DATE_ONLY_TABLE_ID
+from vigorish.util.exceptions import InvalidSeasonException
+
+# (wins, losses, runs, runs_against)
+TeamRecord = Tuple[int, int, int, int]
+NO_GAMES: TeamRecord = (0, 0, 0, 0)
+
+
+def get_game_results(games: List[db.GameScrapeStatus]) -> Dict[str, TeamRecord]:
+    results = {}
+    for game in games:
+        away_won = game.away_team_runs_scored > game.home_team_runs_scored
+        home_won = game.home_team_runs_scored > game.away_team_runs_scored
+        away_result = (int(away_won), int(not away_won), game.away_team_runs_scored, game.home_team_runs_scored)
+        home_result = (int(home_won), int(not home_won), game.home_team_runs_scored, game.away_team_runs_scored)
+        for team_id, result in [(game.away_team_id_br, away_result), (game.home_team_id_br, home_result)]:
+            results[team_id] = add_records(results.get(team_id, NO_GAMES), result)
+    return results
+
+
+def add_records(record: TeamRecord, other: TeamRecord) -> TeamRecord:
+    return tuple(x + y for x, y in zip(record, other))
+
+
+class SeasonStandings:
+    """Cumulative win/loss and run totals for every team in a season, one entry per date with completed games."""
+
+    def __init__(self, season_id: int, teams: List[Dict[str, object]]):
+        self.season_id = season_id
+        self.teams = teams
+        self.date_ids: List[int] = []
+        self.records: Dict[str, List[TeamRecord]] = {team["team_id_br"]: [] for team in teams}
+        self.checked_through = 0
+
+    def extend(self, db_session: Session, date_id: int):
+        """Add the results for every date after the last one counted, up to and including date_id."""
+        # Boxscores for the most recent date may have been scraped since it was counted, so it is rebuilt
+        start_date_id = self.date_ids[-1] if self.date_ids else 0
+        self.truncate(start_date_id)
+        games = (
+            db_session.query(db.GameScrapeStatus)
+            .filter(db.GameScrapeStatus.season_id == self.season_id)
+            .filter(db.GameScrapeStatus.scrape_status_date_id >= start_date_id)
+            .filter(db.GameScrapeStatus.scrape_status_date_id <= date_id)
+            .filter(db.GameScrapeStatus.scraped_bbref_boxscore == 1)
+            .order_by(db.GameScrapeStatus.scrape_status_date_id)
+        )
+        for game_date_id, games_on_date in groupby(games, key=lambda game: game.scrape_status_date_id):
+            self.add_date(game_date_id, get_game_results(list(games_on_date)))
+        self.checked_through = max(self.checked_through, date_id)
+
+    def add_date(self, date_id: int, results: Dict[str, TeamRecord]):
+        self.date_ids.append(date_id)
+        for team_id, records in self.records.items():
+            previous = records[-1] if records else NO_GAMES
+            records.append(add_records(previous, results.get(team_id, NO_GAMES)))
+
+    def truncate(self, date_id: int):
+        index = bisect_left(self.date_ids, date_id)
+        del self.date_ids[index:]
+        for records in self.records.values():
+            del records[index:]
+
+    def get_record(self, team_id: str, date_id: int) -> TeamRecord:
+        index = bisect_right(self.date_ids, date_id)
+        return self.records[team_id][index - 1] if index else NO_GAMES
+
+    def get_standings(self, date_id: int) -> List[Dict[str, object]]:
+        standings = []
+        for team in self.teams:
+            (wins, losses, runs, runs_against) = self.get_record(team["team_id_br"], date_id)
+            standings.append({**team, "wins": wins, "losses": losses, "runs": runs, "runs_against": runs_against})
+        return standings
+
+
+class StandingsRegistry:
+    """Season standings built once from game results and extended as later dates are requested.
+
+    Standings for a date are looked up with a binary search over the dates in the season, replacing
+    ScrapedData.get_season_standings, which queries every team's games for each request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seasons: Dict[int, SeasonStandings] = {}
+
+    def get_season_standings(
+        self, db_session: Session, year: int, game_date: Union[date, datetime]
+    ) -> List[Dict[str, object]]:
+        date_id = int(game_date.strftime(DATE_ONLY_TABLE_ID))
+        with self.lock:
+            season = self.seasons.get(year)
+            if not season:
+                season = self.create_season_standings(db_session, year)
+            if date_id > season.checked_through:
+                season.extend(db_session, date_id)
+            return season.get_standings(date_id)
+
+    def create_season_standings(self, db_session: Session, year: int) -> SeasonStandings:
+        try:
+            season_id = db.Season.find_by_year(db_session, year).id
+        except InvalidSeasonException:
+            season_id = None
+        teams = [team.as_dict() for team in db.Team.get_all_teams_for_season(db_session, year)]
+        self.seasons[year] = SeasonStandings(season_id, teams)
+        return self.seasons[year]
+
+    def warm(self, session_factory, years: List[int]):
+        session = session_factory()
+        try:
+            for year in years:
+                try:
+                    season = db.Season.find_by_year(session, year)
+                    self.get_season_standings(session, year, season.end_date)
+                except (SQLAlchemyError, InvalidSeasonException) as ex:
+                    print(f"Unable to build {year} season standings: {repr(ex)}")
+        finally:
+            session.close()
+
+    def refresh(self):
+        """Discard all standings, each season is rebuilt on next use (call when vig.db is replaced)."""
+        with self.lock:
+            self.seasons = {}
+
+
+standings_registry = StandingsRegistry()
@@ -2,6 +2,7 @@ import hashlib
 import requests
 from pathlib import Path
 from urllib.parse import urlsplit
+from zipfile import BadZipFile, ZipFile
 
 from tqdm import tqdm
 from vigorish.util.result import Result
@@ -9,7 +10,7 @@ from vigorish.util.result import Result
 CHUNK_SIZE = 1024
 
 
-def download_file(url: str, local_folder: Path, chunk_size: int = None):
+def download_file(url: str, local_folder: Path, chunk_size: int = None, md5=None):
     file_name = get_file_name_from_url(url)
     local_file_path = local_folder.joinpath(file_name)
     r = requests.head(url)
@@ -17,6 +18,8 @@ def download_file(url: str, local_folder: Path, chunk_size: int = None):
     accept_ranges = r.headers.get("accept-ranges", 'none')
     if not remote_file_size:
         return Result.Fail(f'Request for "{file_name}" did not return a response containing the file size.')
+    if not chunk_size:
+        chunk_size = CHUNK_SIZE
     local_file_size = 0
     resume_header = None
     fopen_mode = "wb"
@@ -27,16 +30,18 @@ def download_file(url: str, local_folder: Path, chunk_size: int = None):
             local_file_size = local_file_path.stat().st_size
             if local_file_size == remote_file_size:
                 print(f'"{file_name}" is complete. Skipping...')
+                if md5:
+                    update_hash_from_file(md5, local_file_path, chunk_size)
                 return Result.Ok(local_file_path)
+            if md5:
+                update_hash_from_file(md5, local_file_path, chunk_size)
             resume_header = {"Range": f"bytes={local_file_size}-"}
             fopen_mode = "ab"
             print(f'"{file_name}" is incomplete. Resuming...')
         else:
             print(f'The web host for "{file_name}" does not support resuming partial downloads. Beginning new download...')
             local_file_path.unlink()
-    
-    if not chunk_size:
-        chunk_size = CHUNK_SIZE
+
     r = requests.get(url, stream=True, headers=resume_header)
     with open(local_file_path, fopen_mode) as f:
         with tqdm(
@@ -49,16 +54,22 @@ def download_file(url: str, local_folder: Path, chunk_size: int = None):
             ascii=True,
             miniters=1,
         ) as pbar:
-            for chunk in r.iter_content(32 * chunk_size):
-                f.write(chunk)
-                pbar.update(len(chunk))
+            try:
+                for chunk in r.iter_content(32 * chunk_size):
+                    f.write(chunk)
+                    if md5:
+                        md5.update(chunk)
+                    pbar.update(len(chunk))
+            except requests.RequestException:
+                # Dropped connection, the size check below reports the partial file so it is resumed
+                pass
 
     local_file_size = local_file_path.stat().st_size
     if local_file_size == remote_file_size:
         return Result.Ok(local_file_path)
     more_or_fewer = "more" if local_file_size > remote_file_size else "fewer"
     error = (
-        f'Recieved {more_or_fewer} bytes than expected for "{file_name}"!\n'
+        f'Received {more_or_fewer} bytes than expected for "{file_name}"!\n'
         f"Expected File Size: {remote_file_size:,} bytes\n"
         f"Received File Size: {local_file_size:,} bytes"
     )
@@ -69,17 +80,45 @@ def get_file_name_from_url(url):
     return Path(urlsplit(url).path).name
 
 
-def validate_file(local_file_path: Path, hash_file_path: Path, chunk_size: int = None) -> Result:
+def validate_file(local_file_path: Path, hash_file_path: Path, chunk_size: int = None, md5=None) -> Result:
     if not local_file_path.exists():
         return Result.Fail(f"Unable to locate file: {local_file_path}")
-    if not chunk_size:
-        chunk_size = CHUNK_SIZE
-    md5 = hashlib.md5()
-    with open(local_file_path, "rb") as f:
-        while chunk := f.read(chunk_size):
-            md5.update(chunk)
+    if not md5:
+        md5 = hashlib.md5()
+        update_hash_from_file(md5, local_file_path, chunk_size)
     return (
         Result.Ok()
         if md5.hexdigest() == hash_file_path.read_text()
         else Result.Fail(f"MD5 hash for {local_file_path.name} is incorrect!")
     )
+
+
+def update_hash_from_file(md5, local_file_path: Path, chunk_size: int = None):
+    if not chunk_size:
+        chunk_size = CHUNK_SIZE
+    with open(local_file_path, "rb") as f:
+        while chunk := f.read(32 * chunk_size):
+            md5.update(chunk)
+    return md5
+
+
+def extract_zip_file(zip_file_path: Path, local_folder: Path, executor, max_workers: int) -> Result:
+    try:
+        with ZipFile(zip_file_path, mode="r") as zip:
+            members = sorted((m for m in zip.infolist() if not m.is_dir()), key=lambda m: m.header_offset)
+        for folder in {local_folder.joinpath(m.filename).parent for m in members}:
+            folder.mkdir(parents=True, exist_ok=True)
+        batch_size = max(len(members) // max_workers, 1) + 1
+        batches = [members[i : i + batch_size] for i in range(0, len(members), batch_size)]
+        futures = [executor.submit(extract_zip_members, zip_file_path, local_folder, batch) for batch in batches]
+        file_count = sum(future.result() for future in futures)
+    except (BadZipFile, OSError) as ex:
+        return Result.Fail(f"Error extracting {zip_file_path.name}: {repr(ex)}")
+    return Result.Ok((file_count, sum(m.file_size for m in members)))
+
+
+def extract_zip_members(zip_file_path: Path, local_folder: Path, members) -> int:
+    with ZipFile(zip_file_path, mode="r") as zip:
+        for member in members:
+            zip.extract(member, path=local_folder)
+    return len(members)
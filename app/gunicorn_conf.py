@@ -0,0 +1,51 @@
+"""Production launcher settings: gunicorn managing uvicorn workers.
+
+    gunicorn app.main:app -c app/gunicorn_conf.py
+
+The app is imported once in the master process (preload_app), so the data sync in initialize(), the settings,
+the shared Vigorish instance and the in-process player and standings indexes are built before the workers are
+forked and are shared with them copy-on-write.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:80")
+workers = int(os.environ.get("WEB_CONCURRENCY", 0)) or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+keepalive = int(os.environ.get("KEEP_ALIVE", 5))
+timeout = int(os.environ.get("TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 120))
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    from app.core.database import create_vig_app, engine, SessionLocal
+    from app.data.initialize import MLB_SEASONS
+    from app.data.player_registry import player_registry
+    from app.data.standings import standings_registry
+
+    create_vig_app()
+    player_registry.warm(SessionLocal)
+    standings_registry.warm(SessionLocal, MLB_SEASONS)
+    # SQLite connections must not be shared with the workers, each one opens its own after the fork
+    engine.dispose()
+    # Objects that exist now are never freed, moving them out of the collector's reach keeps their pages
+    # from being written to (and copied) when a worker runs a collection
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Warm state built in master process, {gc.get_freeze_count()} objects frozen")
+
+
+def post_fork(server, worker):
+    from app.core.config import settings
+    from app.core.database import engine
+
+    # The async engine is left alone: the master never connects with it, and disposing its pool replaces the
+    # asyncio lock that guards the first connection with a thread lock, which deadlocks concurrent requests
+    engine.dispose(close=False)
+    # Warmed responses are shared through Redis, so only the first worker spawned requests them
+    if worker.age > 1:
+        settings.CACHE_WARMUP = False
@@ -7,10 +7,11 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
 from fastapi_redis_cache import FastApiRedisCache
 from starlette.responses import RedirectResponse
-from vigorish.app import Vigorish
 
-from app.api.api_v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import QueryCountMiddleware
+from app.core.snapshots import SnapshotMiddleware
+from app.data.initialize import sync_remote_files
 
 
 APP_FOLDER = Path(__file__).parent
@@ -23,6 +24,8 @@ app = FastAPI(
     docs_url=f"{settings.API_VERSION}/docs" if settings.ENV == "DEV" else None,
     redoc_url=None,
 )
+# Added before CORSMiddleware so that responses served from snapshots also get CORS headers
+app.add_middleware(SnapshotMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -36,17 +39,54 @@ app.add_middleware(
     allow_methods=["GET"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryCountMiddleware)
 app.mount("/static", StaticFiles(directory=str(STATIC_FOLDER)), name="static")
 
 
+def register_routers(app: FastAPI):
+    from app.api.api_v1.api import api_router
+
+    app.include_router(api_router, prefix=settings.API_VERSION)
+
+
 @app.on_event("startup")
 def startup():
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from vigorish.app import Vigorish
+
+    from app.core.database import SessionLocal
+    from app.data.initialize import MLB_SEASONS
+    from app.data.player_registry import player_registry
+    from app.data.season_data import season_data
+    from app.data.standings import standings_registry
+
+    if settings.FAST_START:
+        if settings.ENV == "PROD":
+            sync_remote_files()
+        register_routers(app)
+    # Started here rather than by sync_remote_files, which runs in the gunicorn master before the workers are
+    # forked (the thread would only exist in the master)
+    if season_data.seasons:
+        season_data.hydrate_in_background()
+    player_registry.warm(SessionLocal)
+    standings_registry.warm(SessionLocal, MLB_SEASONS)
     redis_cache = FastApiRedisCache()
     redis_cache.init(
         host_url=settings.REDIS_URL,
         response_header=settings.CACHE_HEADER,
-        ignore_arg_types=[Vigorish],
+        ignore_arg_types=[Vigorish, AsyncSession],
     )
+    if settings.CACHE_WARMUP:
+        from app.core.cache_warmer import warm_cache_in_background
+
+        app.state.cache_warmer = warm_cache_in_background(app)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    from app.core.database import async_engine
+
+    await async_engine.dispose()
 
 
 @app.get(f"{settings.API_VERSION}/docs", include_in_schema=False)
@@ -66,4 +106,5 @@ def get_api_root():
     return RedirectResponse(url=api_docs_url, status_code=int(HTTPStatus.PERMANENT_REDIRECT))
 
 
-app.include_router(api_router, prefix=settings.API_VERSION)
+if not settings.FAST_START:
+    register_routers(app)
@@ -5,7 +5,7 @@ from app.schema_prep.season import convert_season_to_dict, create_divisional_sta
 from app.schema_prep.pfx_batting_metrics import combine_career_and_yearly_pfx_batting_metrics_sets
 from app.schema_prep.pfx_pitching_metrics import combine_career_and_yearly_pfx_pitching_metrics_sets
 from app.schema_prep.pitch_stats import convert_pitch_stats
-from app.schema_prep.pitchfx import convert_pfx_times_to_est, convert_pfx_list
+from app.schema_prep.pitchfx import convert_pfx_times_to_est, convert_pfx_list, convert_pfx_list_without_game_data
 from app.schema_prep.team import convert_team_stats, convert_team_stats_by_year
 from app.schema_prep.all_player_stats import (
     calc_career_bat_stats_for_player,
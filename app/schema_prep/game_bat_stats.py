@@ -2,6 +2,7 @@ from typing import Dict, Union
 
 import vigorish.database as db
 
+from app.data.player_registry import player_registry
 from app.schemas import GameBatStatsSchema
 
 
@@ -10,7 +11,7 @@ def convert_bat_stats(bat_stats: db.BatStats):
     bat_stats_dict["extra_base_hits"] = calc_extra_base_hits(bat_stats_dict)
     bat_stats_dict["total_bases"] = calc_total_bases(bat_stats_dict)
     bat_stats_dict["stat_line"] = parse_bat_stats_for_game(bat_stats_dict)
-    bat_stats_dict["player_name"] = bat_stats.player.name
+    bat_stats_dict["player_name"] = player_registry.get_name(bat_stats.player_id) or bat_stats.player.name
     return bat_stats_dict
 
 
@@ -1,23 +1,21 @@
-from datetime import datetime
 from typing import Dict, Union
 
 import vigorish.database as db
-from vigorish.app import Vigorish
 
+from app.data.player_registry import player_registry
 from app.schemas import GamePitchStatsSchema
 
 
-def convert_pitch_stats(pitch_stats: db.PitchStats, app: Vigorish, game_date: datetime):
+def convert_pitch_stats(pitch_stats: db.PitchStats, pitcher_records: Dict[int, Dict[str, int]]):
     pitch_stats_dict = convert_pitch_stats_to_dict(pitch_stats)
-    mlb_id = pitch_stats_dict["player_id_mlb"]
-    (wins, losses) = app.scraped_data.get_pitcher_record_on_date(mlb_id, game_date)
-    pitch_stats_dict["wins"] = wins
-    pitch_stats_dict["losses"] = losses
-    pitch_stats_dict["saves"] = app.scraped_data.get_pitcher_total_saves_on_date(mlb_id, game_date)
+    pitcher_record = pitcher_records.get(pitch_stats.player_id, {})
+    pitch_stats_dict["wins"] = pitcher_record.get("wins", 0)
+    pitch_stats_dict["losses"] = pitcher_record.get("losses", 0)
+    pitch_stats_dict["saves"] = pitcher_record.get("saves", 0)
     pitch_stats_dict["full_stat_line"] = parse_full_pitch_app_stats(pitch_stats_dict)
     pitch_stats_dict["summary_stat_line"] = parse_summary_pitch_app_stats(pitch_stats_dict)
     pitch_stats_dict["csw"] = pitch_stats_dict["strikes_swinging"] + pitch_stats_dict["strikes_looking"]
-    pitch_stats_dict["player_name"] = pitch_stats.player.name
+    pitch_stats_dict["player_name"] = player_registry.get_name(pitch_stats.player_id) or pitch_stats.player.name
     return pitch_stats_dict
 
 
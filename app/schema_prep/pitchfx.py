@@ -18,6 +18,10 @@ def convert_pfx_list(app: Vigorish, pfx: List[db.PitchFx]) -> List[PitchFxSchema
     return list(map(convert_naive_pfx_times, map(convert_pfx_times_to_est, pfx_dicts)))
 
 
+def convert_pfx_list_without_game_data(pfx: List[db.PitchFx]) -> List[PitchFxSchema]:
+    return [convert_naive_pfx_times(populate_count(p.as_dict())) for p in pfx]
+
+
 def populate_count(pfx: db.PitchFx):
     pfx["count"] = f'{pfx["balls"]}-{pfx["strikes"]}'
     pfx["two_strike_count"] = pfx["strikes"] == 2
@@ -1,27 +1,40 @@
 import vigorish.database as db
+from vigorish.util.list_helpers import make_chunked_list
 
 from app.schema_prep.constants import TEAM_ID_MAP
 
+MAX_SQL_VARIABLES = 500
 
-def convert_team_stats_by_year(stats_by_year):
+
+def convert_team_stats_by_year(db_session, stats_by_year):
     for stats in stats_by_year.values():
-        stats = convert_team_stats(stats)
+        stats = convert_team_stats(db_session, stats)
     return stats_by_year
 
 
 def convert_team_stats(db_session, team_stats):
+    all_stats = []
     if isinstance(team_stats, dict):
-        for stats in team_stats.values():
-            convert_for_api_response(db_session, stats)
+        all_stats = list(team_stats.values())
     if isinstance(team_stats, list):
-        for stats in team_stats:
-            convert_for_api_response(db_session, stats)
+        all_stats = team_stats
+    player_names = get_player_names(db_session, {int(stats["mlb_id"]) for stats in all_stats if stats.get("mlb_id")})
+    for stats in all_stats:
+        convert_for_api_response(player_names, stats)
     return team_stats
 
 
-def convert_for_api_response(db_session, stats):
+def get_player_names(db_session, mlb_ids):
+    player_names = {}
+    for chunk in make_chunked_list(list(mlb_ids), MAX_SQL_VARIABLES):
+        query = db_session.query(db.PlayerId.mlb_id, db.PlayerId.mlb_name).filter(db.PlayerId.mlb_id.in_(chunk))
+        player_names.update(dict(query.all()))
+    return player_names
+
+
+def convert_for_api_response(player_names, stats):
     assign_league_and_division_to_team_stats(stats)
-    add_player_names_to_team_pitching_stats(db_session, stats)
+    add_player_names_to_team_pitching_stats(player_names, stats)
     return stats
 
 
@@ -30,9 +43,8 @@ def assign_league_and_division_to_team_stats(team_stats):
     team_stats["division"] = TEAM_ID_MAP[team_stats["player_team_id_bbref"]]["division"]
 
 
-def add_player_names_to_team_pitching_stats(db_session, pitch_stats):
+def add_player_names_to_team_pitching_stats(player_names, pitch_stats):
     pitch_stats["player_name"] = ""
     if pitch_stats.get("mlb_id"):
-        player_id = db.PlayerId.find_by_mlb_id(db_session, pitch_stats["mlb_id"])
-        pitch_stats["player_name"] = player_id.mlb_name if player_id else ""
+        pitch_stats["player_name"] = player_names.get(int(pitch_stats["mlb_id"])) or ""
     return pitch_stats
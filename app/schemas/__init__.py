@@ -16,3 +16,4 @@ from app.schemas.pitchfx import PitchFxSchema
 from app.schemas.player import FuzzySearchResult, PlayerDetailsSchema
 from app.schemas.season import ScoreboardSchema, SeasonSchema
 from app.schemas.team import TeamLeagueStandings, TeamSchema
+from app.schemas.data_status import CacheStatsSchema, DataStatusSchema, SeasonDataStatusSchema
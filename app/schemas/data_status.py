@@ -0,0 +1,42 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class SeasonDataStatusSchema(BaseModel):
+    year: int
+    status: str
+    message: str
+
+
+class DataStatusSchema(BaseModel):
+    ready: bool
+    seasons: List[SeasonDataStatusSchema]
+
+
+class CacheTierStatsSchema(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class LocalCacheStatsSchema(CacheTierStatsSchema):
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class RedisCacheStatsSchema(CacheTierStatsSchema):
+    connected: bool
+
+
+class CoalescedRequestsSchema(BaseModel):
+    worker: int
+    redis: int
+
+
+class CacheStatsSchema(BaseModel):
+    local: LocalCacheStatsSchema
+    redis: RedisCacheStatsSchema
+    coalesced: CoalescedRequestsSchema
+    data_version: str
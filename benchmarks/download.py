@@ -0,0 +1,109 @@
+"""Measure end-to-end bootstrap time and throughput of DownloadManager against a local object store.
+
+Generates season archives filled with JSON documents, serves them with benchmarks.object_store
+and downloads, validates and extracts every archive once per combination of chunk size and
+concurrency:
+
+    python -m benchmarks.download --files 6 --docs 2000 --chunk-sizes 1024 8192 65536 --concurrency 1 2 4
+    python -m benchmarks.download --throttle 20000000 --truncate 3
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from statistics import median
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from app.data.download_manager import DownloadManager, RemoteFileInfo
+from benchmarks.object_store import ObjectStoreServer
+
+
+def create_season_archive(bucket: Path, year: int, docs: int):
+    zip_file = bucket.joinpath(f"{year}.zip")
+    rng = random.Random(year)
+    with ZipFile(zip_file, "w", compression=ZIP_DEFLATED) as zip:
+        for i in range(docs):
+            doc = {
+                "bbref_game_id": f"BEN{year}{i:05d}",
+                "pitchfx": [{"px": rng.uniform(-2, 2), "pz": rng.uniform(0, 5), "des": "Ball"} for _ in range(60)],
+            }
+            zip.writestr(f"combined_data/BEN{year}{i:05d}_COMBINED_DATA.json", json.dumps(doc))
+    bucket.joinpath(f"{year}.zip.md5").write_text(hashlib.md5(zip_file.read_bytes()).hexdigest())
+    return zip_file
+
+
+def get_remote_files(server: ObjectStoreServer, target: Path, years):
+    remote_files = []
+    for year in years:
+        season_folder = target.joinpath(f"json/{year}")
+        season_folder.mkdir(parents=True, exist_ok=True)
+        remote_files.append(
+            RemoteFileInfo(
+                f"{server.url}/{year}.zip", f"{server.url}/{year}.zip.md5", season_folder, season_folder, year
+            )
+        )
+    return remote_files
+
+
+def run_bootstrap(bucket: Path, years, chunk_size: int, max_workers: int, throttle: int, truncate: int):
+    server = ObjectStoreServer(bucket, throttle=throttle, truncate=truncate).start()
+    target = Path(tempfile.mkdtemp(prefix="vig-bench-"))
+    try:
+        download_manager = DownloadManager(
+            get_remote_files(server, target, years), max_workers=max_workers, chunk_size=chunk_size
+        )
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            download_manager.run()
+        elapsed = time.perf_counter() - start
+        if not download_manager.all_tasks_successfully_complete:
+            raise RuntimeError(download_manager.errors)
+        return elapsed, server.bytes_sent
+    finally:
+        server.stop()
+        shutil.rmtree(target)
+
+
+def run_benchmark(args):
+    bucket = Path(tempfile.mkdtemp(prefix="vig-bucket-"))
+    years = list(range(2017, 2017 + args.files))
+    try:
+        archive_bytes = sum(create_season_archive(bucket, year, args.docs).stat().st_size for year in years)
+        print(f"\n#### DOWNLOAD BENCHMARK ({args.files} archives, {archive_bytes:,} bytes, median of {args.runs} runs)")
+        print(f"{'chunk size':>12} {'workers':>8} {'time (s)':>10} {'MB/s':>8} {'sent (MB)':>10}")
+        for chunk_size in args.chunk_sizes:
+            for max_workers in args.concurrency:
+                runs = [
+                    run_bootstrap(bucket, years, chunk_size, max_workers, args.throttle, args.truncate)
+                    for _ in range(args.runs)
+                ]
+                elapsed = median(run[0] for run in runs)
+                bytes_sent = median(run[1] for run in runs)
+                print(
+                    f"{chunk_size:>12,} {max_workers:>8} {elapsed:>10.3f} "
+                    f"{archive_bytes / elapsed / 1e6:>8.1f} {bytes_sent / 1e6:>10.1f}"
+                )
+    finally:
+        shutil.rmtree(bucket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=6, help="Number of season archives")
+    parser.add_argument("--docs", type=int, default=1000, help="Number of JSON documents in each archive")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1024, 8192, 65536])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--throttle", type=int, default=0, help="Maximum bytes per second for each response")
+    parser.add_argument("--truncate", type=int, default=0, help="Number of GET responses to cut short per run")
+    parser.add_argument("--runs", type=int, default=3)
+    run_benchmark(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""A local stand-in for the S3-compatible bucket that hosts vig.db and the season archives.
+
+Serves files from a folder with the behavior download_file() depends on: HEAD requests,
+Accept-Ranges and Range requests for resuming partial downloads. Responses can be throttled
+and a number of GET responses can be cut short to exercise the retry/resume path:
+
+    python -m benchmarks.object_store --root /tmp/bucket --port 8765 --throttle 5000000 --truncate 2
+"""
+import argparse
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RANGE_REGEX = re.compile(r"^bytes=(?P<start>\d+)-(?P<end>\d*)$")
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class ObjectStoreRequestHandler(SimpleHTTPRequestHandler):
+    server: "ObjectStoreServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        file_path = self.get_file_path()
+        if not file_path:
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", str(file_path.stat().st_size))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        file_path = self.get_file_path()
+        if not file_path:
+            return
+        file_size = file_path.stat().st_size
+        start, end = 0, file_size - 1
+        match = RANGE_REGEX.match(self.headers.get("Range", ""))
+        if match:
+            start = int(match.group("start"))
+            end = int(match.group("end")) if match.group("end") else end
+            if start >= file_size:
+                self.send_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                return
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
+        else:
+            self.send_response(HTTPStatus.OK)
+        length = end - start + 1
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if self.server.claim_truncation():
+            length //= 2
+            self.close_connection = True
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            sent = self.send_bytes(f, length)
+        self.server.add_bytes_sent(sent)
+
+    def get_file_path(self):
+        file_path = self.server.root.joinpath(self.path.lstrip("/").split("?")[0])
+        if not file_path.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return None
+        return file_path
+
+    def send_bytes(self, f, length):
+        throttle = self.server.throttle
+        start = time.perf_counter()
+        sent = 0
+        while sent < length:
+            chunk = f.read(min(WRITE_CHUNK_SIZE, length - sent))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            sent += len(chunk)
+            if throttle:
+                delay = sent / throttle - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+        return sent
+
+
+class ObjectStoreServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, root: Path, port: int = 0, throttle: int = 0, truncate: int = 0):
+        super().__init__(("127.0.0.1", port), ObjectStoreRequestHandler)
+        self.root = root
+        self.throttle = throttle
+        self.truncate = truncate
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def claim_truncation(self) -> bool:
+        with self.lock:
+            if self.truncate <= 0:
+                return False
+            self.truncate -= 1
+            return True
+
+    def add_bytes_sent(self, sent: int):
+        with self.lock:
+            self.bytes_sent += sent
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, required=True, help="Folder containing the files to serve")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--throttle", type=int, default=0, help="Maximum bytes per second for each response")
+    parser.add_argument("--truncate", type=int, default=0, help="Number of GET responses to cut short")
+    args = parser.parse_args()
+    server = ObjectStoreServer(args.root, args.port, args.throttle, args.truncate)
+    print(f"Serving {args.root} at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare response times of DB-heavy endpoints with the default and read-only SQLite profiles.
+
+Both profiles are run against the same copy of vig.db, with the response cache disabled:
+
+    python -m benchmarks.sqlite_profile --db app/data/vig.db --game-date 20210701 --requests 20
+"""
+import argparse
+import time
+from pathlib import Path
+from statistics import median, quantiles
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from vigorish.app import Vigorish
+
+from app.core import database
+from app.core.config import settings
+from app.main import app
+
+ENDPOINTS = [
+    "/season/pitch_stats_for_date?game_date={game_date}",
+    "/season/bat_stats_for_date?game_date={game_date}",
+    "/season/barrels_for_date?game_date={game_date}",
+    "/season/standings_on_date?game_date={game_date}",
+    "/season/scoreboard?game_date={game_date}",
+]
+
+
+def use_profile(db_file: Path, read_only: bool):
+    engine = database.create_db_engine(f"sqlite:///{db_file.resolve()}", read_only)
+    database.db_session.remove()
+    database.db_session.configure(bind=engine)
+    vig_app = Vigorish(dotenv_file=settings.DOTENV_FILE, db_engine=engine, db_session=database.db_session)
+
+    async def get_vig_app(session=Depends(database.get_db_session)):
+        return vig_app
+
+    async_engine = database.create_async_db_engine(f"sqlite:///{db_file.resolve()}", read_only)
+    async_session = sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+    async def get_async_db_session():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[database.get_vig_app] = get_vig_app
+    app.dependency_overrides[database.get_async_db_session] = get_async_db_session
+    return engine, async_engine
+
+
+def time_endpoint(client: TestClient, url: str, requests: int):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url, headers={"Cache-Control": "no-store"})
+        timings.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}: {response.text[:200]}")
+    return timings
+
+
+def run_benchmark(args):
+    urls = [f"{settings.API_VERSION}{e.format(game_date=args.game_date)}" for e in ENDPOINTS]
+    results = {}
+    with TestClient(app) as client:
+        for profile, read_only in [("default", False), ("read-only", True)]:
+            engine, async_engine = use_profile(args.db, read_only)
+            for url in urls:
+                timings = time_endpoint(client, url, args.requests)
+                results[(profile, url)] = (timings[0], median(timings[1:]), quantiles(timings[1:], n=20)[-1])
+            engine.dispose()
+            client.portal.call(async_engine.dispose)
+    return urls, results
+
+
+def report(urls, results, requests):
+    print(f"\n#### SQLITE PROFILE BENCHMARK ({requests} requests per endpoint, times in ms) ####")
+    print(f"{'endpoint':<50} {'profile':<10} {'first':>8} {'median':>8} {'p95':>8}")
+    for url in urls:
+        for profile in ["default", "read-only"]:
+            first, med, p95 = results[(profile, url)]
+            print(f"{url.split('?')[0]:<50} {profile:<10} {first * 1000:>8.1f} {med * 1000:>8.1f} {p95 * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, required=True, help="Path to vig.db")
+    parser.add_argument("--game-date", default="20210701", help="Date as a string in YYYYMMDD format")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    report(*run_benchmark(args), args.requests)
+
+
+if __name__ == "__main__":
+    main()
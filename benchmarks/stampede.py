@@ -0,0 +1,166 @@
+"""Measure a cache stampede with and without single-flight request coalescing.
+
+Starts one or more uvicorn servers (each a separate process, like gunicorn workers) running a route decorated
+with app.core.cache.cache that takes --compute-time seconds to build its response. Every round, --clients
+threads request the same uncached key at the same moment, which is what happens when a popular entry expires:
+
+    python -m benchmarks.stampede --clients 32 --rounds 5 --compute-time 0.5
+    python -m benchmarks.stampede --servers 4 --redis-url redis://127.0.0.1:6379
+
+The report shows how many times the response was computed per round and the latency seen by the clients.
+With one server, coalescing happens in the worker. With more than one, requests handled by different servers
+are only coalesced through the Redis lock, so a reachable Redis server is required to see the effect.
+"""
+import argparse
+import http.client
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median, quantiles
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi_redis_cache import FastApiRedisCache
+
+from app.core.cache import cache
+from app.core.config import settings
+
+CACHE_HEADER = "X-Vigorish-Cache"
+STARTUP_TIMEOUT = 30
+
+
+def create_app(redis_url: str, computations: multiprocessing.Value, compute_time: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.on_event("startup")
+    def startup():
+        FastApiRedisCache().init(host_url=redis_url, prefix="stampede", response_header=CACHE_HEADER)
+
+    @app.get("/expensive")
+    @cache(expire=60)
+    def expensive(round: int, run: int, request: Request, response: Response):
+        with computations.get_lock():
+            computations.value += 1
+        time.sleep(compute_time)
+        return {"round": round, "run": run, "computed_at": time.time()}
+
+    return app
+
+
+def run_server(port: int, redis_url: str, single_flight: bool, computations: multiprocessing.Value, compute_time):
+    settings.CACHE_SINGLE_FLIGHT = single_flight
+    app = create_app(redis_url, computations, compute_time)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def start_servers(args, single_flight: bool, computations: multiprocessing.Value):
+    context = multiprocessing.get_context("fork")
+    servers = [
+        context.Process(
+            target=run_server,
+            args=(args.port + i, args.redis_url, single_flight, computations, args.compute_time),
+            daemon=True,
+        )
+        for i in range(args.servers)
+    ]
+    for server in servers:
+        server.start()
+    for i in range(args.servers):
+        wait_until_ready(args.port + i)
+    return servers
+
+
+def wait_until_ready(port: int):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/docs")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start within {STARTUP_TIMEOUT} seconds")
+
+
+def send_request(port: int, url: str, barrier: threading.Barrier):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    conn.connect()
+    barrier.wait()
+    start = time.perf_counter()
+    conn.request("GET", url)
+    response = conn.getresponse()
+    response.read()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return response.status, response.getheader(CACHE_HEADER), elapsed
+
+
+def run_benchmark(args, single_flight: bool):
+    computations = multiprocessing.Value("i", 0)
+    servers = start_servers(args, single_flight, computations)
+    results, computed = [], []
+    try:
+        with ThreadPoolExecutor(max_workers=args.clients) as executor:
+            for round in range(args.rounds):
+                # A key no client has requested before stands in for an entry that has just expired
+                url = f"/expensive?round={round}&run={int(time.time() * 1000)}"
+                barrier = threading.Barrier(args.clients)
+                before = computations.value
+                futures = [
+                    executor.submit(send_request, args.port + i % args.servers, url, barrier)
+                    for i in range(args.clients)
+                ]
+                results.extend(future.result() for future in futures)
+                computed.append(computations.value - before)
+    finally:
+        for server in servers:
+            server.terminate()
+            server.join()
+    timings = [elapsed for _, _, elapsed in results]
+    return {
+        "single_flight": "on" if single_flight else "off",
+        "computed": sum(computed) / len(computed),
+        "max_computed": max(computed),
+        "hits": sum(1 for _, header, _ in results if header == "Hit"),
+        "misses": sum(1 for _, header, _ in results if header == "Miss"),
+        "errors": sum(1 for status, _, _ in results if status != 200),
+        "median": median(timings),
+        "p95": quantiles(timings, n=20)[-1],
+        "max": max(timings),
+    }
+
+
+def report(results, args):
+    print(
+        f"\n#### STAMPEDE BENCHMARK ({args.servers} server(s), {args.clients} clients, {args.rounds} rounds, "
+        f"{args.compute_time}s to compute, times in ms) ####"
+    )
+    print(
+        f"{'single-flight':>13} {'computed/round':>15} {'max computed':>13} {'hits':>6} {'misses':>7} "
+        f"{'errors':>7} {'median':>8} {'p95':>8} {'max':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['single_flight']:>13} {r['computed']:>15.1f} {r['max_computed']:>13} {r['hits']:>6} "
+            f"{r['misses']:>7} {r['errors']:>7} {r['median'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} "
+            f"{r['max'] * 1000:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=1, help="Number of server processes")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent requests for the same key")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--compute-time", type=float, default=0.5, help="Seconds to build the response")
+    parser.add_argument("--redis-url", default=settings.REDIS_URL or "redis://127.0.0.1:6379")
+    parser.add_argument("--port", type=int, default=8941)
+    args = parser.parse_args()
+    report([run_benchmark(args, single_flight) for single_flight in [False, True]], args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measure how long it takes to import and start the API, broken down by phase.
+
+Each run happens in a fresh interpreter so that module caching does not hide import costs:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --fast-start
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+PHASES = ["framework", "settings", "db_engine", "vigorish", "routers", "app", "startup"]
+
+CHILD_SCRIPT = """
+import asyncio
+import json
+import time
+
+timings = {}
+start = time.perf_counter()
+
+def mark(phase):
+    global start
+    now = time.perf_counter()
+    timings[phase] = now - start
+    start = now
+
+import fastapi, pydantic, sqlalchemy
+mark("framework")
+from app.core.config import settings
+mark("settings")
+import app.core.database
+mark("db_engine")
+import vigorish.app
+mark("vigorish")
+import app.api.api_v1.api
+mark("routers")
+import app.main
+mark("app")
+asyncio.run(app.main.app.router.startup())
+mark("startup")
+timings["total_routes"] = len(app.main.app.routes)
+print(json.dumps(timings))
+"""
+
+IMPORT_ONLY_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+import app.main
+print(json.dumps({"import_app_main": time.perf_counter() - start}))
+"""
+
+
+def run_child(script, fast_start):
+    env = dict(os.environ, FAST_START="YES" if fast_start else "NO")
+    result = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True, cwd=get_repo_root()
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def get_repo_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_benchmark(runs, fast_start):
+    phase_timings = [run_child(CHILD_SCRIPT, fast_start) for _ in range(runs)]
+    import_timings = [run_child(IMPORT_ONLY_SCRIPT, fast_start) for _ in range(runs)]
+    results = {phase: median(t[phase] for t in phase_timings) for phase in PHASES}
+    results["total"] = sum(results[phase] for phase in PHASES)
+    results["import_app_main"] = median(t["import_app_main"] for t in import_timings)
+    return results
+
+
+def report(results, fast_start, runs):
+    mode = "FAST_START=YES" if fast_start else "FAST_START=NO"
+    print(f"\n#### STARTUP BENCHMARK ({mode}, median of {runs} runs) ####")
+    for phase in PHASES:
+        print(f"{phase:.<20}: {results[phase] * 1000:10.1f} ms")
+    print(f"{'total':.<20}: {results['total'] * 1000:10.1f} ms")
+    print(f"{'import app.main':.<20}: {results['import_app_main'] * 1000:10.1f} ms\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--fast-start", action="store_true")
+    args = parser.parse_args()
+    report(run_benchmark(args.runs, args.fast_start), args.fast_start, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Measure throughput and memory per worker of the gunicorn launcher with 1, 2, 4 and 8 workers.
+
+Each configuration starts `gunicorn app.main:app -c app/gunicorn_conf.py` against the database in the app's
+settings, drives it with concurrent clients for a fixed duration, and reads the memory of the master and every
+worker from /proc/<pid>/smaps_rollup (Linux only):
+
+    python -m benchmarks.workers --workers 1 2 4 8 --duration 20 --concurrency 16 --game-date 20210701
+
+PSS splits shared pages evenly between the processes that map them, USS counts only the pages private to a
+process. The USS of a worker is the real cost of adding one, the gap between its RSS and USS is the memory
+shared copy-on-write with the master. Requests are sent with "Cache-Control: no-store" (the response cache
+is bypassed) unless --use-cache is given.
+"""
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import mean, median, quantiles
+
+from app.core.config import settings
+
+ROOT_FOLDER = Path(__file__).parent.parent
+ENDPOINTS = [
+    "/season?year={year}",
+    "/season/standings_on_date?game_date={game_date}",
+    "/season/scoreboard?game_date={game_date}",
+    "/season/pitch_stats_for_date?game_date={game_date}",
+    "/season/bat_stats_for_date?game_date={game_date}",
+    "/team/batting/all_teams?year={year}",
+]
+MEMORY_FIELDS = ["Rss", "Pss", "Private_Clean", "Private_Dirty"]
+STARTUP_TIMEOUT = 120
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "app.main:app",
+            "-c",
+            "app/gunicorn_conf.py",
+            "--workers",
+            str(workers),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--access-logfile",
+            "/dev/null",
+        ],
+        cwd=ROOT_FOLDER,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def get_worker_pids(master_pid: int):
+    children = Path(f"/proc/{master_pid}/task/{master_pid}/children")
+    return [int(pid) for pid in children.read_text().split()] if children.exists() else []
+
+
+def wait_until_ready(server: subprocess.Popen, workers: int, port: int):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {server.returncode}")
+        if len(get_worker_pids(server.pid)) == workers:
+            try:
+                send_request(port, "/", {})
+                return
+            except OSError:
+                pass
+        time.sleep(0.5)
+    raise RuntimeError(f"gunicorn did not start {workers} worker(s) within {STARTUP_TIMEOUT} seconds")
+
+
+def stop_server(server: subprocess.Popen):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def send_request(port: int, url: str, headers: dict, conn: http.client.HTTPConnection = None):
+    conn = conn or http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("GET", url, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def run_client(port: int, urls: list, headers: dict, duration: float, offset: int):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    timings, errors = [], 0
+    deadline = time.monotonic() + duration
+    i = offset
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            status = send_request(port, urls[i % len(urls)], headers, conn)
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            status = 0
+        timings.append(time.perf_counter() - start)
+        if status != 200:
+            errors += 1
+        i += 1
+    conn.close()
+    return timings, errors
+
+
+def read_memory(pid: int):
+    memory = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, value = line.partition(":")
+        if name in MEMORY_FIELDS:
+            memory[name] = int(value.split()[0]) / 1024
+    return {"rss": memory["Rss"], "pss": memory["Pss"], "uss": memory["Private_Clean"] + memory["Private_Dirty"]}
+
+
+def run_benchmark(workers: int, args):
+    urls = [f"{settings.API_VERSION}{e.format(game_date=args.game_date, year=args.game_date[:4])}" for e in ENDPOINTS]
+    headers = {} if args.use_cache else {"Cache-Control": "no-store"}
+    server = start_server(workers, args.port)
+    try:
+        wait_until_ready(server, workers, args.port)
+        for url in urls:
+            send_request(args.port, url, headers)
+        with ProcessPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [
+                executor.submit(run_client, args.port, urls, headers, args.duration, i) for i in range(args.concurrency)
+            ]
+            results = [future.result() for future in futures]
+        master = read_memory(server.pid)
+        worker_memory = [read_memory(pid) for pid in get_worker_pids(server.pid)]
+    finally:
+        stop_server(server)
+    timings = [t for client_timings, _ in results for t in client_timings]
+    return {
+        "workers": workers,
+        "requests": len(timings),
+        "errors": sum(errors for _, errors in results),
+        "req_per_sec": len(timings) / args.duration,
+        "median": median(timings),
+        "p95": quantiles(timings, n=20)[-1],
+        "master_pss": master["pss"],
+        "worker_rss": mean(m["rss"] for m in worker_memory),
+        "worker_pss": mean(m["pss"] for m in worker_memory),
+        "worker_uss": mean(m["uss"] for m in worker_memory),
+        "total_pss": master["pss"] + sum(m["pss"] for m in worker_memory),
+    }
+
+
+def report(results, args):
+    print(
+        f"\n#### WORKERS BENCHMARK ({args.concurrency} clients, {args.duration}s per run, times in ms, memory in MB) ####"
+    )
+    print(
+        f"{'workers':>7} {'requests':>9} {'errors':>7} {'req/s':>8} {'median':>8} {'p95':>8} "
+        f"{'master PSS':>11} {'worker RSS':>11} {'worker PSS':>11} {'worker USS':>11} {'total PSS':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['workers']:>7} {r['requests']:>9} {r['errors']:>7} {r['req_per_sec']:>8.1f} "
+            f"{r['median'] * 1000:>8.1f} {r['p95'] * 1000:>8.1f} {r['master_pss']:>11.1f} {r['worker_rss']:>11.1f} "
+            f"{r['worker_pss']:>11.1f} {r['worker_uss']:>11.1f} {r['total_pss']:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load for each worker count")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() * 2, help="Number of client processes")
+    parser.add_argument("--game-date", default="20210701", help="Date as a string in YYYYMMDD format")
+    parser.add_argument("--port", type=int, default=8931)
+    parser.add_argument("--use-cache", action="store_true", help="Allow responses to be served from the cache")
+    args = parser.parse_args()
+    report([run_benchmark(workers, args) for workers in args.workers], args)
+
+
+if __name__ == "__main__":
+    main()
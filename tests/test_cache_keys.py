@@ -0,0 +1,76 @@
+import types
+from datetime import date
+
+from app.core import cache_keys
+from app.core.cache_keys import CacheInvalidations, get_cache_key, get_key_patterns, get_route_season, is_stale
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, name, key, amount):
+        values = self.hashes.setdefault(name, {})
+        values[key.encode()] = values.get(key.encode(), 0) + amount
+        return values[key.encode()]
+
+    def hgetall(self, name):
+        return {key: str(value).encode() for key, value in self.hashes.get(name, {}).items()}
+
+
+class DataVersion:
+    def get(self, year=None):
+        return {None: "aaaaaaaa", 2021: "bbbbbbbb"}.get(year, "00000000")
+
+
+def get_team_stats(year: int, team_id: str):
+    pass
+
+
+get_team_stats.__module__ = "app.api.api_v1.endpoints.team.batting"
+
+
+def test_route_season_is_found_in_any_argument():
+    assert get_route_season(get_team_stats, types.SimpleNamespace(year=2021), "KCA") == 2021
+    assert get_route_season(get_team_stats, 0, types.SimpleNamespace(date=date(2019, 7, 1))) == 2019
+    assert get_route_season(get_team_stats, 0, "KCA202104010_01_KCA_1_TEX_2_0") == 2021
+    assert get_route_season(get_team_stats, 0, ("KCA202104010", "TEX202104020")) == 2021
+    assert get_route_season(get_team_stats, 0, ("KCA201904010", "TEX202104020")) is None
+
+
+def test_cache_key_is_scoped_by_family_season_version_and_epoch(monkeypatch):
+    monkeypatch.setattr(cache_keys, "data_version", DataVersion())
+    invalidations = CacheInvalidations(poll_interval=0)
+    key = get_cache_key("api", [], invalidations, None, 2021, get_team_stats, 2021, "KCA")
+    assert key.startswith("api:team:2021:bbbbbbbb:0:")
+    invalidations.invalidate(None, "team", 2021)
+    key = get_cache_key("api", [], invalidations, None, 2021, get_team_stats, 2021, "KCA")
+    assert key.startswith("api:team:2021:bbbbbbbb:1:")
+    key = get_cache_key(None, [], invalidations, None, None, get_team_stats, 2021, "KCA")
+    assert key.startswith("team:all:aaaaaaaa:1:")
+
+
+def test_invalidation_epochs_only_go_up():
+    redis = FakeRedis()
+    first, second = CacheInvalidations(poll_interval=0), CacheInvalidations(poll_interval=0)
+    assert [first.invalidate(redis, "team", 2021) for _ in range(3)] == [1, 2, 3]
+    assert second.invalidate(redis, "team", 2021) == 4
+    assert first.get_epoch(redis, "team", 2021) == 4
+    assert first.get_epoch(redis, "season", 2021) == 0
+    assert first.invalidate(redis, season=2021) == 1
+    assert first.get_epoch(redis, "season", 2021) == 1
+    # Routes that span every season see invalidations of any season
+    assert first.get_epoch(redis, "team", None) == 4
+
+
+def test_stale_keys_are_the_ones_for_another_data_version(monkeypatch):
+    monkeypatch.setattr(cache_keys, "data_version", DataVersion())
+    assert not is_stale("api:team:2021:bbbbbbbb:0:func()", "api")
+    assert is_stale("api:team:2021:cccccccc:0:func()", "api")
+    assert is_stale("team:all:bbbbbbbb:0:func()", None)
+    assert not is_stale("other:key", None)
+
+
+def test_key_patterns_include_routes_for_every_season():
+    assert get_key_patterns("api", "team", 2021) == ["api:team:2021:*", "api:team:all:*"]
+    assert len(get_key_patterns(None)) == len(cache_keys.ROUTE_FAMILIES)
@@ -0,0 +1,99 @@
+import asyncio
+import types
+from datetime import datetime
+
+import pytest
+import vigorish.database as db
+from sqlalchemy import Boolean, create_engine, DateTime, event, Float, Integer
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core import crud
+from app.core.metrics import count_query, query_counter, QueryCounter
+from app.schema_prep import convert_bat_stats, convert_pitch_stats
+
+GAME_DATE = datetime(2021, 7, 1)
+DATE_ID = 20210701
+
+
+def create_row(model, **values):
+    row = {}
+    for column in model.__table__.columns:
+        if isinstance(column.type, Boolean):
+            row[column.name] = False
+        elif isinstance(column.type, (Integer, Float)):
+            row[column.name] = 0
+        elif isinstance(column.type, DateTime):
+            row[column.name] = GAME_DATE
+        else:
+            row[column.name] = "x"
+    row.update(values)
+    return model(**row)
+
+
+def create_db(db_file, players):
+    engine = create_engine(f"sqlite:///{db_file}")
+    db.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(db.Season(id=1, year=2021, season_type="REGULAR_SEASON", start_date=GAME_DATE, end_date=GAME_DATE))
+        session.add(db.DateScrapeStatus(id=DATE_ID, game_date=GAME_DATE, season_id=1))
+        for i in range(1, players + 1):
+            session.add(create_row(db.Player, id=i, mlb_id=i, name_first="Player", name_last=str(i), bbref_id=f"p{i}"))
+            session.add(create_row(db.PitchStats, id=i, player_id=i, date_id=DATE_ID, season_id=1))
+            session.add(create_row(db.BatStats, id=i, player_id=i, date_id=DATE_ID, season_id=1))
+        session.commit()
+    engine.dispose()
+
+
+def count_queries(func, *args):
+    counter = QueryCounter()
+    token = query_counter.set(counter)
+    try:
+        result = func(*args)
+    finally:
+        query_counter.reset(token)
+    return (result, counter.count)
+
+
+def get_daily_pitching_stats(db_file):
+    engine = create_engine(f"sqlite:///{db_file}")
+    event.listen(engine, "before_cursor_execute", count_query)
+    session = Session(engine)
+    try:
+        app = types.SimpleNamespace(db_session=session)
+
+        def get_pitch_stats():
+            pitch_stats = crud.get_pitch_stats_for_date(str(DATE_ID), app)
+            pitcher_records = crud.get_pitcher_records_on_date(GAME_DATE, app)
+            return [convert_pitch_stats(p, pitcher_records) for p in pitch_stats]
+
+        return count_queries(get_pitch_stats)
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def get_daily_batting_stats(db_file):
+    async def get_bat_stats():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+        event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+        try:
+            async with AsyncSession(engine) as session:
+                bat_stats = await crud.get_bat_stats_for_date_async(str(DATE_ID), session)
+                return [convert_bat_stats(b) for b in bat_stats]
+        finally:
+            await engine.dispose()
+
+    return count_queries(asyncio.run, get_bat_stats())
+
+
+@pytest.mark.parametrize("get_daily_stats", [get_daily_pitching_stats, get_daily_batting_stats])
+def test_query_count_does_not_grow_with_rows(tmp_path, get_daily_stats):
+    query_counts = []
+    for players in [2, 40]:
+        db_file = tmp_path / f"{players}.db"
+        create_db(db_file, players)
+        (stats, query_count) = get_daily_stats(db_file)
+        assert sorted(s["player_name"] for s in stats) == sorted(f"Player {i}" for i in range(1, players + 1))
+        query_counts.append(query_count)
+    assert query_counts[0] == query_counts[1]
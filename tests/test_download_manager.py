@@ -0,0 +1,60 @@
+import hashlib
+
+import pytest
+
+from app.data.download_manager import DownloadManager
+from app.data.util import download_file
+from benchmarks.download import create_season_archive, get_remote_files
+from benchmarks.object_store import ObjectStoreServer
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    bucket = tmp_path.joinpath("bucket")
+    bucket.mkdir()
+    create_season_archive(bucket, 2021, docs=50)
+    return bucket
+
+
+@pytest.fixture
+def object_store(request, bucket):
+    server = ObjectStoreServer(bucket, truncate=getattr(request, "param", 0)).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize("object_store", [1], indirect=True)
+def test_hash_of_resumed_download_includes_the_partial_file(tmp_path, bucket, object_store):
+    target = tmp_path.joinpath("target")
+    target.mkdir()
+    expected = bucket.joinpath("2021.zip.md5").read_text()
+    result = download_file(f"{object_store.url}/2021.zip", target, md5=hashlib.md5())
+    assert result.failure
+    assert 0 < target.joinpath("2021.zip").stat().st_size < bucket.joinpath("2021.zip").stat().st_size
+    md5 = hashlib.md5()
+    result = download_file(f"{object_store.url}/2021.zip", target, md5=md5)
+    assert result.success
+    assert md5.hexdigest() == expected
+
+
+@pytest.mark.parametrize("object_store", [2], indirect=True)
+def test_truncated_downloads_are_resumed_and_verified(tmp_path, bucket, object_store, capsys):
+    target = tmp_path.joinpath("target")
+    download_manager = DownloadManager(get_remote_files(object_store, target, [2021]), max_workers=1)
+    download_manager.run()
+    assert download_manager.all_tasks_successfully_complete
+    assert download_manager.tasks[0].attempts >= 1
+    assert download_manager.installed_files == {"2021.zip": bucket.joinpath("2021.zip.md5").read_text()}
+    assert len(list(target.joinpath("json/2021/combined_data").glob("*.json"))) == 50
+    assert not target.joinpath("json/2021/2021.zip").exists()
+
+
+def test_corrupt_partial_file_fails_validation(tmp_path, object_store, capsys):
+    target = tmp_path.joinpath("target")
+    remote_files = get_remote_files(object_store, target, [2021])
+    remote_files[0].zip_filepath.write_bytes(b"not the start of the archive")
+    download_manager = DownloadManager(remote_files, max_workers=1)
+    download_manager.run()
+    assert not download_manager.all_tasks_successfully_complete
+    assert "MD5 hash for 2021.zip is incorrect" in download_manager.tasks[0].message
+    assert not download_manager.installed_files
@@ -0,0 +1,50 @@
+import sqlite3
+
+from app.data.indexes import check_indexes, ensure_indexes, get_index_columns, HotQuery, QueryPlanResult
+
+GAME_ID_QUERY = HotQuery("/game/test", "at_bat", ("game_id",), "game_id = ?", ("KCA202104010",))
+ID_QUERY = HotQuery("/at_bat/test", "at_bat", ("id",), "id = ?", (0,))
+
+
+def create_db(db_file, *indexes):
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE at_bat (id INTEGER, game_id TEXT, player_id INTEGER)")
+    for index in indexes:
+        conn.execute(index)
+    conn.commit()
+    return conn
+
+
+def test_get_index_columns():
+    step = "SEARCH pitchfx USING INDEX ix_pitchfx (batter_id=? AND game_start_time_utc>? AND game_start_time_utc<?)"
+    assert get_index_columns(step) == {"batter_id", "game_start_time_utc"}
+    assert get_index_columns("SEARCH at_bat USING COVERING INDEX ix (game_id=?)") == {"game_id"}
+    assert get_index_columns("SCAN at_bat") == set()
+
+
+def test_column_names_are_not_matched_as_substrings():
+    result = QueryPlanResult(ID_QUERY, ["SEARCH at_bat USING INDEX ix_at_bat_game_id (game_id=?)"])
+    assert result.needs_index
+    assert result.status == "PARTIAL"
+
+
+def test_error_is_reported_and_never_indexed():
+    result = QueryPlanResult(GAME_ID_QUERY, [], "Table at_bat has no column(s): game_id")
+    assert not result.needs_index
+    assert result.status == "ERROR"
+
+
+def test_full_table_scan_needs_index(tmp_path):
+    conn = create_db(tmp_path / "vig.db")
+    [result] = check_indexes(conn, [GAME_ID_QUERY])
+    conn.close()
+    assert result.full_table_scan
+    assert result.needs_index
+
+
+def test_ensure_indexes_creates_missing_index(tmp_path, capsys):
+    db_file = tmp_path / "vig.db"
+    create_db(db_file, "CREATE INDEX ix_at_bat_player_id ON at_bat (player_id)").close()
+    [result] = ensure_indexes(db_file, queries=[GAME_ID_QUERY])
+    assert result.status == "OK"
+    assert "Created index ix_at_bat_game_id" in capsys.readouterr().out
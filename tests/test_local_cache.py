@@ -0,0 +1,62 @@
+import types
+
+import pytest
+
+from app.core import cache
+from app.core.cache import LocalCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_least_recently_used_entries_are_evicted_first(clock):
+    local_cache = LocalCache(max_bytes=30, max_ttl=60)
+    local_cache.set("a", {"a": 1}, "a" * 10, ttl=60)
+    local_cache.set("b", {"b": 1}, "b" * 10, ttl=60)
+    local_cache.set("c", {"c": 1}, "c" * 10, ttl=60)
+    assert local_cache.get("a").data == {"a": 1}
+    local_cache.set("d", {"d": 1}, "d" * 10, ttl=60)
+    assert list(local_cache.entries) == ["c", "a", "d"]
+    assert local_cache.get("b") is None
+    assert local_cache.total_bytes == 30
+
+
+def test_entries_larger_than_the_cache_are_not_stored(clock):
+    local_cache = LocalCache(max_bytes=30, max_ttl=60)
+    local_cache.set("a", {"a": 1}, "a" * 10, ttl=60)
+    entry = local_cache.set("b", {"b": 1}, "b" * 31, ttl=60)
+    assert entry.data == {"b": 1}
+    assert list(local_cache.entries) == ["a"]
+    assert local_cache.total_bytes == 10
+
+
+def test_replacing_an_entry_updates_the_total_size(clock):
+    local_cache = LocalCache(max_bytes=30, max_ttl=60)
+    local_cache.set("a", {"a": 1}, "a" * 10, ttl=60)
+    local_cache.set("a", {"a": 2}, "a" * 20, ttl=60)
+    assert local_cache.get("a").data == {"a": 2}
+    assert local_cache.total_bytes == 20
+
+
+def test_entries_expire_after_the_local_ttl(clock):
+    local_cache = LocalCache(max_bytes=100, max_ttl=60)
+    local_cache.set("short", 1, "1", ttl=10)
+    local_cache.set("long", 2, "2", ttl=3600)
+    clock.now += 10
+    assert local_cache.get("short") is None
+    assert local_cache.get("long").ttl == 3590
+    clock.now += 50
+    assert local_cache.get("long") is None
+    assert local_cache.total_bytes == 0
+    assert (local_cache.stats["local"].hits, local_cache.stats["local"].misses) == (1, 2)
+
+
+def test_disabled_cache_stores_nothing(clock):
+    local_cache = LocalCache(max_bytes=0, max_ttl=60)
+    local_cache.set("a", 1, "1", ttl=60)
+    assert local_cache.get("a") is None
+    assert not local_cache.entries
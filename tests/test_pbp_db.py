@@ -0,0 +1,133 @@
+import sqlite3
+from datetime import datetime, timezone
+
+from app.data.pbp_db import clear_season, compile_game, create_tables, PlayByPlayDatabase
+from app.schemas import AtBatSchema, PitchFxSchema
+from app.schemas.game_data.at_bat import PlayByPlayEvent, PlayerSubEvent
+
+GAME_ID = "KCA202104010"
+AT_BAT_ID = f"{GAME_ID}_01_KCA_123456_TEX_654321_0"
+INVALID_AT_BAT_ID = f"{GAME_ID}_01_KCA_123456_TEX_654321_1"
+PITCH_TIME = datetime(2021, 4, 1, 20, 10, tzinfo=timezone.utc)
+
+
+class DataVersion:
+    def __init__(self, versions):
+        self.versions = versions
+
+    def get(self, year=None):
+        return self.versions.get(year, "00000000")
+
+
+class GameData:
+    def __init__(self, at_bats, pfx):
+        self.bbref_game_id = GAME_ID
+        self.at_bat_map = at_bats
+        self.pfx = pfx
+
+    @property
+    def valid_at_bats(self):
+        return [at_bat for at_bat_id, at_bat in self.at_bat_map.items() if at_bat_id != INVALID_AT_BAT_ID]
+
+    def get_pbp_for_at_bat(self, at_bat_id):
+        return self.at_bat_map[at_bat_id]
+
+    def get_pfx_for_at_bat(self, at_bat_id):
+        return self.pfx.get(at_bat_id, [])
+
+
+def create_values(schema, **values):
+    for name, field in schema.__fields__.items():
+        if name in values:
+            continue
+        if field.type_ is bool:
+            values[name] = True
+        elif field.type_ is datetime:
+            values[name] = PITCH_TIME
+        elif field.type_ in (int, float):
+            values[name] = field.type_(len(name))
+        elif field.outer_type_ is not field.type_:
+            values[name] = [[name, "x"]]
+        else:
+            values[name] = name
+    return values
+
+
+def create_at_bat(at_bat_id):
+    events = [
+        create_values(PlayByPlayEvent, at_bat_id=at_bat_id, event_type="AT_BAT", is_complete_at_bat=False),
+        create_values(PlayerSubEvent, at_bat_id=at_bat_id, event_type="SUBSTITUTION"),
+    ]
+    return create_values(AtBatSchema, at_bat_id=at_bat_id, pbp_events=events)
+
+
+def create_game_data():
+    at_bats = {at_bat_id: create_at_bat(at_bat_id) for at_bat_id in [AT_BAT_ID, INVALID_AT_BAT_ID]}
+    pfx = {AT_BAT_ID: [create_values(PitchFxSchema, at_bat_id=AT_BAT_ID, ab_count=count) for count in [1, 2]]}
+    return GameData(at_bats, pfx)
+
+
+def create_db(db_file, game_data, *seasons):
+    conn = sqlite3.connect(db_file)
+    create_tables(conn)
+    with conn:
+        compile_game(conn, game_data)
+        conn.executemany("INSERT INTO season VALUES (?, ?)", seasons)
+    return conn
+
+
+def test_rows_are_read_as_the_combined_game_data(tmp_path):
+    game_data = create_game_data()
+    create_db(tmp_path / "pbp.db", game_data, (2021, "aaaaaaaa")).close()
+    pbp_db = PlayByPlayDatabase(tmp_path / "pbp.db", DataVersion({2021: "aaaaaaaa"}))
+    at_bat = AtBatSchema(**game_data.get_pbp_for_at_bat(AT_BAT_ID))
+    assert [AtBatSchema(**row) for row in pbp_db.get_all_at_bats_for_game(GAME_ID, 2021)] == [at_bat]
+    assert AtBatSchema(**pbp_db.get_pbp_for_at_bat(AT_BAT_ID, 2021)) == at_bat
+    assert AtBatSchema(**pbp_db.get_pbp_for_at_bat(INVALID_AT_BAT_ID, 2021)).at_bat_id == INVALID_AT_BAT_ID
+    assert list(map(type, at_bat.pbp_events)) == [PlayByPlayEvent, PlayerSubEvent]
+    pfx = [PitchFxSchema(**pitch) for pitch in game_data.get_pfx_for_at_bat(AT_BAT_ID)]
+    assert [PitchFxSchema(**row) for row in pbp_db.get_pfx_for_at_bat(AT_BAT_ID, 2021)] == pfx
+    assert pbp_db.get_pfx_for_at_bat(INVALID_AT_BAT_ID, 2021) == []
+    assert pbp_db.get_pbp_for_at_bat(AT_BAT_ID, None) is None
+
+
+def test_rows_compiled_from_another_data_version_are_ignored(tmp_path):
+    create_db(tmp_path / "pbp.db", create_game_data(), (2021, "aaaaaaaa")).close()
+    pbp_db = PlayByPlayDatabase(tmp_path / "pbp.db", DataVersion({2021: "bbbbbbbb"}))
+    assert pbp_db.get_all_at_bats_for_game(GAME_ID, 2021) is None
+    assert pbp_db.get_pbp_for_at_bat(AT_BAT_ID, 2021) is None
+    assert pbp_db.get_pfx_for_at_bat(AT_BAT_ID, 2021) is None
+
+
+def test_seasons_that_are_not_compiled_are_ignored(tmp_path):
+    conn = create_db(tmp_path / "pbp.db", create_game_data(), (2021, "aaaaaaaa"))
+    with conn:
+        clear_season(conn, 2021)
+    for table in ["at_bat", "pbp_event", "pitch", "season"]:
+        assert conn.execute(f"SELECT count(*) FROM {table}").fetchone() == (0,)
+    conn.close()
+    pbp_db = PlayByPlayDatabase(tmp_path / "pbp.db", DataVersion({2021: "aaaaaaaa"}))
+    assert pbp_db.get_pbp_for_at_bat(AT_BAT_ID, 2021) is None
+
+
+def test_databases_without_season_versions_are_ignored(tmp_path):
+    conn = create_db(tmp_path / "pbp.db", create_game_data())
+    conn.execute("DROP TABLE season")
+    conn.close()
+    pbp_db = PlayByPlayDatabase(tmp_path / "pbp.db", DataVersion({}))
+    assert pbp_db.get_all_at_bats_for_game(GAME_ID, 2021) is None
+
+
+def test_databases_compiled_with_another_layout_are_rebuilt(tmp_path):
+    conn = sqlite3.connect(tmp_path / "pbp.db")
+    conn.execute("CREATE TABLE at_bat (at_bat_id TEXT PRIMARY KEY, game_id TEXT, pbp TEXT)")
+    conn.execute("CREATE TABLE at_bat_pitchfx (at_bat_id TEXT PRIMARY KEY, game_id TEXT, pitchfx TEXT)")
+    pbp_db = PlayByPlayDatabase(tmp_path / "pbp.db", DataVersion({2021: "aaaaaaaa"}))
+    assert pbp_db.get_pbp_for_at_bat(AT_BAT_ID, 2021) is None
+    create_tables(conn)
+    with conn:
+        compile_game(conn, create_game_data())
+        conn.execute("INSERT INTO season VALUES (?, ?)", (2021, "aaaaaaaa"))
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'at_bat_pitchfx'").fetchone() is None
+    conn.close()
+    assert pbp_db.get_pbp_for_at_bat(AT_BAT_ID, 2021)["at_bat_id"] == AT_BAT_ID
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+import types
+
+import pytest
+
+from app.core import cache
+from app.core.cache import get_in_flight_requests, get_response_single_flight, LocalCache
+
+KEY = "season:2021:00000000:0:app.api.api_v1.endpoints.season.get_season(year=2021)"
+
+
+class FakeLock:
+    def __init__(self, name: str):
+        self.name = name
+
+    def acquire(self, blocking: bool):
+        return False
+
+
+class FakeRedis:
+    """Another server holds the lock for every key and caches the response after `polls` checks."""
+
+    def __init__(self, response: object, polls: int):
+        self.response = response
+        self.polls = polls
+
+    def lock(self, name: str, **kwargs):
+        return FakeLock(name)
+
+    def exists(self, name: str):
+        return True
+
+
+def create_redis_cache(redis=None):
+    redis_cache = types.SimpleNamespace(redis=redis, connected=bool(redis), log=lambda *args, **kwargs: None)
+    redis_cache.not_connected = not redis_cache.connected
+
+    def check_cache(key):
+        redis.polls -= 1
+        return (60, json.dumps(redis.response)) if redis.polls <= 0 else (-1, None)
+
+    redis_cache.check_cache = check_cache
+    return redis_cache
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    local_cache = LocalCache(max_bytes=1024, max_ttl=60)
+    monkeypatch.setattr(cache, "local_cache", local_cache)
+    monkeypatch.setattr(cache, "LOCK_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(cache.settings, "CACHE_SINGLE_FLIGHT", True)
+    return local_cache
+
+
+def test_concurrent_misses_are_computed_once(local_cache):
+    calls = []
+
+    async def get_season(year):
+        calls.append(year)
+        await asyncio.sleep(0.05)
+        return {"year": year}
+
+    async def request_all():
+        requests = [get_response_single_flight(create_redis_cache(), KEY, 60, get_season, 2021) for _ in range(10)]
+        return await asyncio.gather(*requests)
+
+    results = asyncio.run(request_all())
+    assert calls == [2021]
+    assert all(response_data == {"year": 2021} for (_, response_data, _) in results)
+    assert sorted(cache_hit for (_, _, cache_hit) in results) == [False] + [True] * 9
+    assert local_cache.coalesced["worker"] == 9
+
+
+def test_exceptions_are_raised_in_every_waiting_request():
+    calls = []
+
+    async def get_season(year):
+        calls.append(year)
+        await asyncio.sleep(0.05)
+        raise ValueError(year)
+
+    async def request_all():
+        requests = [get_response_single_flight(create_redis_cache(), KEY, 60, get_season, 2021) for _ in range(3)]
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        return (results, dict(get_in_flight_requests()))
+
+    (results, in_flight) = asyncio.run(request_all())
+    assert calls == [2021]
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not in_flight
+
+
+def test_in_flight_requests_are_kept_per_event_loop():
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    async def get_season(year):
+        started.set()
+        await asyncio.to_thread(release.wait, 5)
+        return {"year": year}
+
+    def request_on_new_loop(name: str, func):
+        results[name] = asyncio.run(get_response_single_flight(create_redis_cache(), KEY, 60, func, 2021))
+
+    async def get_season_now(year):
+        return {"year": year, "loop": "second"}
+
+    first = threading.Thread(target=request_on_new_loop, args=("first", get_season))
+    first.start()
+    assert started.wait(5)
+    # The first loop's future cannot be awaited here, so the second loop computes the response itself
+    request_on_new_loop("second", get_season_now)
+    release.set()
+    first.join(5)
+    assert results["first"][1:] == ({"year": 2021}, False)
+    assert results["second"][1:] == ({"year": 2021, "loop": "second"}, False)
+
+
+def test_misses_wait_for_the_server_holding_the_redis_lock(local_cache):
+    calls = []
+
+    def get_season(year):
+        calls.append(year)
+        return {"year": year}
+
+    redis_cache = create_redis_cache(FakeRedis({"year": 2021}, polls=3))
+    (entry, response_data, cache_hit) = asyncio.run(get_response_single_flight(redis_cache, KEY, 60, get_season, 2021))
+    assert not calls
+    assert (response_data, cache_hit) == ({"year": 2021}, True)
+    assert local_cache.get(KEY) is entry
+    assert local_cache.coalesced["redis"] == 1
@@ -0,0 +1,98 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+import vigorish.database as db
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from vigorish.data.scraped_data import ScrapedData
+from vigorish.enums import SeasonType
+
+from app.data.standings import StandingsRegistry
+
+TEAMS = ["BAL", "BOS", "NYY", "TBR", "TOR", "LAD"]
+OPENING_DAY = datetime(2021, 4, 1)
+SEASON_DAYS = 30
+
+
+@pytest.fixture(scope="module")
+def db_session():
+    engine = create_engine("sqlite://")
+    db.Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add(
+        db.Season(
+            id=1,
+            year=2021,
+            start_date=OPENING_DAY,
+            end_date=OPENING_DAY + timedelta(days=SEASON_DAYS - 1),
+            season_type=SeasonType.REGULAR_SEASON,
+        )
+    )
+    session.add_all(db.Team(id=i, year=2021, team_id_br=t, league="AL", division="E") for i, t in enumerate(TEAMS, 1))
+    rng = random.Random(3)
+    game_id = 0
+    for day in range(SEASON_DAYS):
+        game_date = OPENING_DAY + timedelta(days=day)
+        date_id = int(game_date.strftime("%Y%m%d"))
+        session.add(db.DateScrapeStatus(id=date_id, game_date=game_date, season_id=1))
+        if day % 7 == 3:
+            # Off day
+            continue
+        teams = rng.sample(TEAMS, len(TEAMS))
+        for away, home in zip(teams[::2], teams[1::2]):
+            game_id += 1
+            session.add(
+                db.GameScrapeStatus(
+                    id=game_id,
+                    bbref_game_id=f"{home}{date_id}0",
+                    game_date=game_date,
+                    scrape_status_date_id=date_id,
+                    season_id=1,
+                    away_team_id_br=away,
+                    home_team_id_br=home,
+                    away_team_runs_scored=rng.randint(0, 8),
+                    home_team_runs_scored=rng.randint(0, 8),
+                    # A few boxscores are missing, their games are left out of the standings
+                    scraped_bbref_boxscore=int(rng.random() > 0.05),
+                )
+            )
+    session.commit()
+    yield session
+    session.close()
+
+
+def get_vigorish_standings(db_session, game_date):
+    scraped_data = ScrapedData.__new__(ScrapedData)
+    scraped_data.db_session = db_session
+    return scraped_data.get_season_standings(2021, game_date)
+
+
+def by_team(standings):
+    return sorted(standings, key=lambda team: team["team_id_br"])
+
+
+def test_standings_match_vigorish_on_every_date(db_session):
+    registry = StandingsRegistry()
+    # Out of order, so that dates before the last one computed are looked up as well as new ones
+    for day in [5, 3, 20, 2, 29, 29, 10, 0, 3, 1]:
+        game_date = OPENING_DAY + timedelta(days=day)
+        standings = registry.get_season_standings(db_session, 2021, game_date)
+        assert by_team(standings) == by_team(get_vigorish_standings(db_session, game_date)), game_date.date()
+
+
+def test_dates_already_computed_do_not_query_the_database(db_session):
+    registry = StandingsRegistry()
+    last_day = OPENING_DAY + timedelta(days=SEASON_DAYS - 1)
+    registry.get_season_standings(db_session, 2021, last_day)
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        registry.get_season_standings(db_session, 2021, OPENING_DAY + timedelta(days=12))
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+    assert not statements
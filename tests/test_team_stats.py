@@ -0,0 +1,42 @@
+import vigorish.database as db
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.metrics import count_query, query_counter, QueryCounter
+from app.schema_prep.team import convert_team_stats, MAX_SQL_VARIABLES
+
+
+def create_session(mlb_ids):
+    engine = create_engine("sqlite://")
+    db.PlayerId.__table__.create(engine)
+    event.listen(engine, "before_cursor_execute", count_query)
+    session = Session(engine)
+    session.add_all(db.PlayerId(mlb_id=mlb_id, mlb_name=f"Player {mlb_id}") for mlb_id in mlb_ids)
+    session.commit()
+    return session
+
+
+def count_queries(func, *args):
+    counter = QueryCounter()
+    token = query_counter.set(counter)
+    try:
+        result = func(*args)
+    finally:
+        query_counter.reset(token)
+    return (result, counter.count)
+
+
+def test_player_names_are_queried_once_per_chunk():
+    roster_size = MAX_SQL_VARIABLES * 2 + 1
+    mlb_ids = list(range(1, roster_size + 1))
+    session = create_session(mlb_ids)
+    team_stats = [{"mlb_id": str(mlb_id), "player_team_id_bbref": "BOS"} for mlb_id in mlb_ids]
+    team_stats.append({"mlb_id": None, "player_team_id_bbref": "BOS"})
+    try:
+        (converted, query_count) = count_queries(convert_team_stats, session, team_stats)
+    finally:
+        session.close()
+    assert query_count == 3
+    assert all(stats["player_name"] == f"Player {stats['mlb_id']}" for stats in converted[:-1])
+    assert converted[-1]["player_name"] == ""
+    assert all(stats["league"] == "AL" and stats["division"] == "E" for stats in converted)